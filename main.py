@@ -7,8 +7,11 @@ Il inclut la configuration CORS et intègre le routeur principal.
 
 import sys
 import os
+import atexit
+import queue
 from pathlib import Path
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
 # Ajouter le répertoire courant au PYTHONPATH
 current_dir = Path(__file__).parent
@@ -19,12 +22,24 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from src.api.router import router
+from src.domain.resilient_llm_service import ResilientLLMService
+from src.infrastructure.llm_providers._http import close_http_client
 
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+
+# Écriture des logs dans un thread dédié : les handlers (stdout, fichiers)
+# ne bloquent jamais la boucle d'événements
+_root_logger = logging.getLogger()
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 
@@ -152,6 +167,10 @@ def create_app() -> FastAPI:
     # Inclusion du routeur principal
     app.include_router(router, prefix="/api")
     
+    # Fermeture des clients LLM mutualisés à l'arrêt
+    app.add_event_handler("shutdown", ResilientLLMService.close)
+    app.add_event_handler("shutdown", close_http_client)
+    
     return app
 
 
@@ -177,6 +196,14 @@ if __name__ == "__main__":
         except locale.Error:
             pass  # Garder la locale par défaut si UTF-8 non disponible
     
+    # Boucle d'événements uvloop (fournie par uvicorn[standard]) si disponible
+    try:
+        import uvloop  # noqa: F401
+        event_loop = "uvloop"
+    except ImportError:
+        event_loop = "asyncio"
+    logger.info("🔁 Boucle d'événements: %s", event_loop)
+    
     # Démarrage de l'application avec uvicorn
     uvicorn.run(
         "main:app",
@@ -184,6 +211,7 @@ if __name__ == "__main__":
         port=8000,
         reload=True,  # Rechargement automatique en développement
         log_level="info",
+        loop=event_loop,
         # Configuration explicite d'encodage
         access_log=True
     )
\ No newline at end of file
@@ -1,5 +1,6 @@
 """FastAPI Router - Endpoints avec Dependency Injection"""
 
+import logging
 from datetime import datetime
 from typing import Optional
 import uuid
@@ -38,6 +39,8 @@ from src.models.data_contracts import (
     SessionResponse
 )
 
+logger = logging.getLogger(__name__)
+
 # Création du router
 router = APIRouter()
 
@@ -309,8 +312,8 @@ async def orchestrate_agent(
         # Sélection de l'agent approprié via Function Calling
         selected_agent = await agent_router.dispatch(user_message, available_agents)
         
-        print(f"🎯 Agent sélectionné: {selected_agent.agent_name}")
-        print(f"📋 Description: {selected_agent.description}")
+        logger.info("🎯 Agent sélectionné: %s", selected_agent.agent_name)
+        logger.info("📋 Description: %s", selected_agent.description)
         
         # ========================================
         # ÉTAPE 2: ORCHESTRATION SPÉCIALISÉE
@@ -601,7 +604,7 @@ async def orchestrate_with_session(
         
         # JALON 4.1-B: Création du tracer pour l'observabilité
         from src.domain.tracer import Tracer
-        tracer = Tracer(session_manager)
+        tracer = Tracer(session.session_id, session_manager)
         
         # Orchestration avec session et traçage
         response = await orchestrator.run_orchestration_with_session(
@@ -635,13 +638,13 @@ async def orchestrate_with_session(
 
 async def _log_session_creation(session_id: str, agent_name: str):
     """Log la création d'une session"""
-    print(f"📝 Session créée: {session_id} pour agent {agent_name}")
+    logger.info("📝 Session créée: %s pour agent %s", session_id, agent_name)
 
 
 async def _update_session_async(session_id: str, session: Session):
     """Met à jour une session de manière asynchrone"""
     try:
         await session_manager.update_session(session)
-        print(f"💾 Session {session_id} sauvegardée avec {session.total_messages} messages")
+        logger.info("💾 Session %s sauvegardée avec %d messages", session_id, session.total_messages)
     except Exception as e:
-        print(f"❌ Erreur sauvegarde session {session_id}: {e}")
\ No newline at end of file
+        logger.error("❌ Erreur sauvegarde session %s: %s", session_id, e)
\ No newline at end of file
@@ -22,8 +22,6 @@ from src.models.data_contracts import (
 if TYPE_CHECKING:
     from .history_summarizer import HistorySummarizer
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -95,7 +93,7 @@ class AgentOrchestrator:
             - Protection contre les boucles infinies
             - Isolation des erreurs d'outils
         """
-        logger.info(f"🚀 Début orchestration avec {len(history)} messages d'historique")
+        logger.info("🚀 Début orchestration avec %d messages d'historique", len(history))
         
         # JALON 4.1-B: Traçage du début de l'orchestration principale
         if tracer:
@@ -107,7 +105,24 @@ class AgentOrchestrator:
         current_history = history.copy()
         iteration = 0
         total_tool_calls = 0
-        max_total_tool_calls = 10  # Protection contre l'abus d'outils
+        
+        # Liaison locale des paramètres de boucle (figés pour toute l'orchestration)
+        max_iter = self.max_iterations
+        max_tools = 10  # Protection contre l'abus d'outils
+        llm_srv = self.llm_service
+        
+        # Longueur du prompt mesurée paresseusement et de façon incrémentale :
+        # l'historique n'est qu'étendu pendant la boucle, seuls les nouveaux
+        # messages sont donc parcourus à chaque itération.
+        measured_count = 0
+        measured_length = 0
+        
+        def prompt_length() -> int:
+            nonlocal measured_count, measured_length
+            for msg in current_history[measured_count:]:
+                measured_length += len(msg.content)
+            measured_count = len(current_history)
+            return measured_length
         
         # Validation préliminaire
         try:
@@ -117,25 +132,37 @@ class AgentOrchestrator:
             if history is None:
                 raise ValueError("Historique requis (peut être vide) pour l'orchestration")
         except Exception as e:
-            logger.error(f"❌ Erreur validation préliminaire: {str(e)}")
+            logger.error("❌ Erreur validation préliminaire: %s", e)
             return self._create_error_response(
                 f"Erreur de validation: {str(e)}", 
                 config, 
                 "VALIDATION_ERROR"
             )
         
-        while iteration < self.max_iterations:
+        # Court-circuit pré-LLM : requêtes traitables sans appel réseau
+        direct_response = self._try_direct_response(config, current_history)
+        if direct_response is not None:
+            logger.info("⚡ Réponse directe sans appel LLM")
+            if tracer:
+                await tracer.log_step(
+                    component="AgentOrchestrator",
+                    event="direct_response",
+                    details={"response_length": len(direct_response.content)}
+                )
+            return direct_response
+        
+        while iteration < max_iter:
             iteration += 1
-            logger.info(f"🔄 Itération {iteration}/{self.max_iterations}")
+            logger.info("🔄 Itération %d/%d", iteration, max_iter)
             
             try:
                 # === PHASE 1: REASONING - Appel LLM ===
                 # JALON 4.1-B: Traçage de l'appel LLM
                 if tracer:
                     await tracer.log_llm_call(
-                        provider=self.llm_service.get_provider_name(),
+                        provider=llm_srv.get_provider_name(),
                         model=config.model_version if hasattr(config, 'model_version') else "unknown",
-                        prompt_length=sum(len(msg.content) for msg in current_history)
+                        prompt_length_provider=prompt_length
                     )
                 
                 # JALON 4.2: Appel LLM résilient avec retry/backoff
@@ -149,8 +176,10 @@ class AgentOrchestrator:
                         "LLM_NULL_RESPONSE"
                     )
                 
-                logger.info(f"📝 Réponse LLM - Tool calls: {len(llm_response.tool_calls)}, "
-                           f"Requires execution: {llm_response.requires_tool_execution}")
+                logger.info(
+                    "📝 Réponse LLM - Tool calls: %d, Requires execution: %s",
+                    len(llm_response.tool_calls), llm_response.requires_tool_execution
+                )
                 
                 # === PHASE 2: CHECK - Analyse de la réponse ===
                 if not llm_response.requires_tool_execution or not llm_response.tool_calls:
@@ -168,16 +197,16 @@ class AgentOrchestrator:
                 
                 # Protection contre l'abus d'outils
                 total_tool_calls += len(llm_response.tool_calls)
-                if total_tool_calls > max_total_tool_calls:
-                    logger.warning(f"⚠️ Limite d'outils atteinte ({total_tool_calls})")
+                if total_tool_calls > max_tools:
+                    logger.warning("⚠️ Limite d'outils atteinte (%d)", total_tool_calls)
                     return self._create_error_response(
-                        f"Limite d'exécutions d'outils atteinte ({max_total_tool_calls})",
+                        f"Limite d'exécutions d'outils atteinte ({max_tools})",
                         config,
                         "TOO_MANY_TOOL_CALLS"
                     )
                 
                 # === PHASE 3: ACTING - Exécution des outils ===
-                logger.info(f"🔧 Exécution de {len(llm_response.tool_calls)} outil(s)")
+                logger.info("🔧 Exécution de %d outil(s)", len(llm_response.tool_calls))
                 
                 # JALON 4.1-B: Traçage de l'exécution d'outils
                 if tracer:
@@ -204,10 +233,10 @@ class AgentOrchestrator:
                     tool_results
                 )
                 
-                logger.info(f"🔄 Résultats injectés - Préparation itération suivante")
+                logger.info("🔄 Résultats injectés - Préparation itération suivante")
                 
             except Exception as e:
-                logger.error(f"❌ Erreur critique durant l'itération {iteration}: {str(e)}")
+                logger.error("❌ Erreur critique durant l'itération %d: %s", iteration, e)
                 
                 # JALON 4.1-B: Traçage des erreurs
                 if tracer:
@@ -223,9 +252,9 @@ class AgentOrchestrator:
                 )
         
         # Limite d'itérations atteinte - Arrêt de sécurité
-        logger.warning(f"⚠️ Limite d'itérations atteinte ({self.max_iterations})")
+        logger.warning("⚠️ Limite d'itérations atteinte (%d)", max_iter)
         return self._create_error_response(
-            f"Limite d'itérations atteinte ({self.max_iterations}). "
+            f"Limite d'itérations atteinte ({max_iter}). "
             f"L'agent n'a pas pu converger vers une réponse finale. "
             f"Cela peut indiquer une boucle logique dans le raisonnement.",
             config,
@@ -233,6 +262,38 @@ class AgentOrchestrator:
         )
     
     
+    def _try_direct_response(
+        self, 
+        config: AgentConfig, 
+        history: List[ChatMessage]
+    ) -> Optional[OrchestrationResponse]:
+        """
+        Tente de répondre sans appel LLM (court-circuit pré-LLM)
+        
+        Args:
+            config: Configuration de l'agent
+            history: Historique de conversation
+            
+        Returns:
+            Réponse directe si la requête ne nécessite pas le LLM, None sinon
+            
+        Cas traités:
+            - Dernier message utilisateur vide (rien à envoyer au LLM)
+        """
+        if history:
+            last_message = history[-1]
+            if last_message.role == "user" and not last_message.content.strip():
+                return OrchestrationResponse(
+                    content="Votre message est vide. Merci de préciser votre demande.",
+                    tool_calls=[],
+                    provider=self.llm_service.get_provider_name(),
+                    model=config.model_version,
+                    usage=None,
+                    requires_tool_execution=False
+                )
+        
+        return None
+    
     def _create_error_response(
         self, 
         error_message: str, 
@@ -292,7 +353,7 @@ class AgentOrchestrator:
             
         except AgentExecutionError as e:
             # JALON 4.2: Gestion sécurisée des erreurs finales de résilience
-            logger.error(f"❌ Échec définitif appel LLM après retry: {str(e)}")
+            logger.error("❌ Échec définitif appel LLM après retry: %s", e)
             
             # Traçage de l'erreur finale sécurisée
             if tracer:
@@ -305,7 +366,7 @@ class AgentOrchestrator:
             
         except Exception as e:
             # Autres erreurs non prévues
-            logger.error(f"❌ Erreur critique inattendue appel LLM: {str(e)}")
+            logger.error("❌ Erreur critique inattendue appel LLM: %s", e)
             
             if tracer:
                 await tracer.log_error(
@@ -332,7 +393,7 @@ class AgentOrchestrator:
             # Limitation du nombre d'outils par appel
             max_concurrent_tools = 5
             if len(tool_calls) > max_concurrent_tools:
-                logger.warning(f"⚠️ Limitation à {max_concurrent_tools} outils par appel")
+                logger.warning("⚠️ Limitation à %d outils par appel", max_concurrent_tools)
                 tool_calls = tool_calls[:max_concurrent_tools]
             
             # Exécution avec timeout global
@@ -346,10 +407,10 @@ class AgentOrchestrator:
             return results
             
         except asyncio.TimeoutError:
-            logger.error(f"❌ Timeout exécution outils ({timeout_seconds}s)")
+            logger.error("❌ Timeout exécution outils (%ss)", timeout_seconds)
             return None
         except Exception as e:
-            logger.error(f"❌ Erreur critique exécution outils: {str(e)}")
+            logger.error("❌ Erreur critique exécution outils: %s", e)
             return None
     
     async def _execute_tool_calls(self, tool_calls: List[ToolCall]) -> List[ToolResult]:
@@ -377,7 +438,7 @@ class AgentOrchestrator:
         tool_results = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                logger.error(f"❌ Erreur outil {tool_calls[i].tool_name}: {str(result)}")
+                logger.error("❌ Erreur outil %s: %s", tool_calls[i].tool_name, result)
                 tool_results.append(ToolResult(
                     tool_call_id=tool_calls[i].id,
                     success=False,
@@ -418,7 +479,7 @@ class AgentOrchestrator:
                 content=result_content
             ))
         
-        logger.info(f"📝 {len(tool_results)} résultat(s) d'outil ajouté(s) à l'historique")
+        logger.info("📝 %d résultat(s) d'outil ajouté(s) à l'historique", len(tool_results))
     
     def _format_tool_calls_for_history(self, tool_calls: List[ToolCall]) -> str:
         """
@@ -507,11 +568,37 @@ class AgentOrchestrator:
             Réponse finale d'orchestration avec session mise à jour
             
         Flow:
-            1. Synthèse de l'historique si seuils dépassés
-            2. Orchestration standard avec historique synthétisé
-            3. Ajout du message utilisateur et de la réponse à la session
+            1. Synthèse de l'historique si seuils dépassés (lancée en tâche de fond)
+            2. Orchestration standard sur un instantané de l'historique, en parallèle
+            3. Attente de la synthèse puis ajout du message utilisateur et de la
+               réponse à l'historique (éventuellement synthétisé) de la session
+        """
+        try:
+            return await self._run_session_turn(request, session, tracer)
+        finally:
+            # Persistance des étapes de trace en file et arrêt de l'écrivain,
+            # y compris lorsque l'orchestration échoue
+            if tracer:
+                await tracer.flush()
+    
+    async def _run_session_turn(
+        self,
+        request: OrchestrationRequest,
+        session: Session,
+        tracer: Optional[Tracer]
+    ) -> OrchestrationResponse:
+        """
+        Exécute un tour d'orchestration avec session (voir run_orchestration_with_session)
+        
+        Args:
+            request: Requête d'orchestration
+            session: Session avec historique persistant
+            tracer: Tracer optionnel pour l'observabilité
+            
+        Returns:
+            Réponse finale d'orchestration avec session mise à jour
         """
-        logger.info(f"🔄 Orchestration avec session {session.session_id}")
+        logger.info("🔄 Orchestration avec session %s", session.session_id)
         
         # JALON 4.1-B: Traçage du début de l'orchestration
         if tracer:
@@ -520,9 +607,13 @@ class AgentOrchestrator:
                 iteration=1
             )
         
-        # Synthèse automatique de l'historique si nécessaire
+        # Synthèse automatique de l'historique si nécessaire, en parallèle du
+        # premier appel LLM : le tour courant n'a pas besoin du résumé
+        summarizer_task = None
         if self.history_summarizer:
-            await self.history_summarizer.summarize_if_needed(session, tracer)
+            summarizer_task = asyncio.create_task(
+                self.history_summarizer.summarize_if_needed(session, tracer)
+            )
         
         # Utilisation de la config d'agent fournie ou création d'une config par défaut
         if request.agent_config:
@@ -531,24 +622,35 @@ class AgentOrchestrator:
             # Configuration par défaut si aucune fournie
             config = AgentConfig()
         
-        response = await self.run_orchestration(config, session.history, tracer)
+        # Instantané de l'historique : la synthèse peut remplacer session.history
+        history_snapshot = list(session.history)
+        
+        try:
+            response = await self.run_orchestration(config, history_snapshot, tracer)
+        except BaseException:
+            if summarizer_task is not None:
+                summarizer_task.cancel()
+            raise
+        
+        # La synthèse doit être terminée avant de modifier l'historique de session
+        if summarizer_task is not None:
+            await summarizer_task
         
-        # Ajout des messages à la session
+        # Ajout des messages à la session (session.history relu après la synthèse)
         user_message = ChatMessage(
             role="user",
             content=request.message
         )
-        session.history.append(user_message)
+        session.append_message(user_message)
         
         assistant_message = ChatMessage(
             role="assistant", 
             content=response.content
         )
-        session.history.append(assistant_message)
+        session.append_message(assistant_message)
         
-        # Mise à jour des métriques de session
+        # Mise à jour de l'horodatage de session
         session.last_message_at = datetime.now()
-        metrics = session.get_history_metrics()
         
         # JALON 4.1-B: Traçage de la réponse finale
         if tracer:
@@ -557,6 +659,6 @@ class AgentOrchestrator:
                 total_steps=len(session.trace) if session.trace else 0
             )
         
-        logger.info(f"✅ Session {session.session_id} mise à jour: {metrics['messages']} messages")
+        logger.info("✅ Session %s mise à jour: %d messages", session.session_id, len(session.history))
         
         return response
\ No newline at end of file
@@ -6,11 +6,19 @@ Il utilise le Function Calling d'un LLM pour analyser l'intention utilisateur
 et sélectionner l'agent spécialisé le plus approprié.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.domain.singleflight import SingleFlight
 from src.domain.tracer import Tracer  # JALON 4.1-B: Intégration du traçage
+from src.infrastructure import json_codec
 from src.models.data_contracts import (
     ChatMessage, 
     AgentDefinition,
@@ -19,10 +27,32 @@ from src.models.data_contracts import (
     OrchestrationResponse
 )
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tokens retenus pour l'heuristique de routage (mots de 4 lettres ou plus)
+_KEYWORD_PATTERN = re.compile(r"\w{4,}")
+
+# Mots vides et termes génériques des descriptions, exclus de l'index heuristique
+_KEYWORD_STOPWORDS = frozenset({
+    "dans", "pour", "avec", "sans", "sous", "vers", "chez", "entre", "depuis",
+    "cette", "tout", "tous", "toute", "toutes", "leur", "leurs", "votre",
+    "vous", "nous", "elle", "elles", "sont", "être", "avoir", "fait", "faire",
+    "peut", "comme", "mais", "plus", "moins", "très", "aussi", "donc", "ainsi",
+    "quel", "quelle", "quels", "quelles", "dont", "autre", "autres",
+    "agent", "agents", "assistant", "spécialisé", "spécialisée", "requête",
+    "requêtes", "question", "questions", "utilisateur", "utilisateurs",
+    "aide", "aider", "tâche", "tâches",
+    "with", "from", "that", "this", "your", "what", "which", "about", "into",
+    "have", "will", "help", "helps", "user", "users", "request", "requests",
+    "task", "tasks", "specialized",
+})
+
+# Nombre minimal de mots-clés distincts du meilleur agent pour décider sans LLM
+_HEURISTIC_MIN_MATCHES = 2
+
+# Rapport minimal entre le score du meilleur agent et celui du suivant
+_HEURISTIC_MIN_MARGIN = 2
+
 
 class AgentSelectionTool(ToolDefinition):
     """
@@ -44,37 +74,78 @@ class AgentSelectionTool(ToolDefinition):
             available_agents: Liste des agents disponibles pour la sélection
             
         Returns:
-            Dict: Schéma d'outil compatible Function Calling
+            Dict: Schéma d'outil compatible Function Calling (partagé entre les
+                appels pour un même ensemble d'agents, à ne pas modifier)
         """
-        # Construction de l'enum des agents disponibles
-        agent_enum = [agent.agent_name for agent in available_agents]
-        agent_descriptions = "\n".join([
-            f"- {agent.agent_name}: {agent.description}"
-            for agent in available_agents
-        ])
-        
-        return {
-            "type": "function",
-            "function": {
-                "name": "select_agent",
-                "description": f"Sélectionne l'agent le plus approprié parmi les agents disponibles. Agents disponibles:\n{agent_descriptions}",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "agent_name": {
-                            "type": "string",
-                            "enum": agent_enum,
-                            "description": "Nom de l'agent sélectionné pour traiter la requête"
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Explication du choix de l'agent (pour debug et transparence)"
-                        }
+        agents_key = tuple(
+            (agent.agent_name, agent.description) for agent in available_agents
+        )
+        return _build_selection_schema(agents_key)
+
+
+@lru_cache(maxsize=128)
+def _build_selection_schema(agents_key: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    """
+    Construit le schéma de l'outil select_agent pour un ensemble d'agents
+    
+    Mis en cache par empreinte (nom, description) des agents : le schéma n'est
+    reconstruit que lorsque le pool d'agents change.
+    
+    Args:
+        agents_key: Paires (agent_name, description) des agents disponibles
+        
+    Returns:
+        Dict: Schéma d'outil compatible Function Calling
+    """
+    # Construction de l'enum des agents disponibles
+    agent_enum = [agent_name for agent_name, _ in agents_key]
+    agent_descriptions = "\n".join([
+        f"- {agent_name}: {description}"
+        for agent_name, description in agents_key
+    ])
+    
+    return {
+        "type": "function",
+        "function": {
+            "name": "select_agent",
+            "description": f"Sélectionne l'agent le plus approprié parmi les agents disponibles. Agents disponibles:\n{agent_descriptions}",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "agent_name": {
+                        "type": "string",
+                        "enum": agent_enum,
+                        "description": "Nom de l'agent sélectionné pour traiter la requête"
                     },
-                    "required": ["agent_name", "reasoning"]
-                }
+                    "reasoning": {
+                        "type": "string",
+                        "description": "Explication du choix de l'agent (pour debug et transparence)"
+                    }
+                },
+                "required": ["agent_name", "reasoning"]
             }
         }
+    }
+
+
+@lru_cache(maxsize=128)
+def _build_keyword_index(agents_key: Tuple[Tuple[str, str], ...]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Construit l'index inversé mot-clé -> agents à partir des descriptions
+    
+    Args:
+        agents_key: Paires (agent_name, description) des agents disponibles
+        
+    Returns:
+        Dict[str, Tuple[str, ...]]: Noms des agents associés à chaque mot-clé
+    """
+    index: Dict[str, List[str]] = {}
+    for agent_name, description in agents_key:
+        for token in set(_KEYWORD_PATTERN.findall(description.lower())):
+            if token in _KEYWORD_STOPWORDS:
+                continue
+            index.setdefault(token, []).append(agent_name)
+    return {token: tuple(names) for token, names in index.items()}
 
 
 class AgentRouter:
@@ -86,15 +157,35 @@ class AgentRouter:
     via Function Calling avec un LLM rapide.
     """
     
-    def __init__(self, llm_service: LLMServiceInterface):
+    def __init__(
+        self,
+        llm_service: LLMServiceInterface,
+        decision_cache_size: int = 256,
+        decision_cache_ttl: float = 300.0,
+        heuristic_confidence_threshold: float = 0.85
+    ):
         """
         Initialise le routeur avec un service LLM pour la prise de décision
         
         Args:
             llm_service: Service LLM configuré pour la décision de routage
                         (recommandé: modèle rapide comme gpt-3.5-turbo ou gemini-flash)
+            decision_cache_size: Nombre maximal de décisions de routage conservées (LRU)
+            decision_cache_ttl: Durée de validité d'une décision en cache (secondes)
+            heuristic_confidence_threshold: Part du score heuristique au-delà de
+                        laquelle l'agent est choisi sans attendre le LLM
         """
         self.llm_service = llm_service
+        
+        # Cache LRU des décisions : clé normalisée -> (horodatage, agent_name)
+        self.decision_cache_size = decision_cache_size
+        self.decision_cache_ttl = decision_cache_ttl
+        self._decision_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.heuristic_confidence_threshold = heuristic_confidence_threshold
+        
+        # Routages en cours, partagés entre requêtes concurrentes identiques
+        self._inflight: SingleFlight[AgentDefinition] = SingleFlight()
+        
         self.router_system_prompt = """Tu es un routeur intelligent spécialisé dans la sélection d'agents.
 
 Ta mission : analyser la requête utilisateur et choisir l'agent le plus approprié.
@@ -107,12 +198,55 @@ Consignes:
 5. Justifie ton raisonnement de manière claire et concise
 
 Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande des clarifications."""
+        
+        # Préparation du routage (message système + schéma d'outil) par version du pool
+        self._system_message = ChatMessage(role="system", content=self.router_system_prompt)
+        self._pool_version: int = -1
+        self._cached_prep: Optional[Tuple[ChatMessage, Dict[str, Any]]] = None
+
+    def prime(self, available_agents: List[AgentDefinition], pool_version: int) -> None:
+        """
+        Précalcule le message système et le schéma d'outil pour un pool d'agents
+        
+        Args:
+            available_agents: Agents du pool
+            pool_version: Version du pool, incrémentée par l'appelant à chaque changement
+        """
+        self._cached_prep = (
+            self._system_message,
+            AgentSelectionTool.create_for_agents(available_agents)
+        )
+        self._pool_version = pool_version
+
+    def _get_routing_prep(
+        self,
+        available_agents: List[AgentDefinition],
+        pool_version: Optional[int]
+    ) -> Tuple[ChatMessage, Dict[str, Any]]:
+        """
+        Retourne le couple (message système, schéma d'outil) pour le routage
+        
+        Args:
+            available_agents: Agents disponibles
+            pool_version: Version du pool, None si l'appelant n'en gère pas
+            
+        Returns:
+            Tuple[ChatMessage, Dict[str, Any]]: Préparation réutilisable
+        """
+        if pool_version is None:
+            # Sans version, le schéma reste mis en cache par empreinte des agents
+            return self._system_message, AgentSelectionTool.create_for_agents(available_agents)
+        
+        if self._cached_prep is None or pool_version != self._pool_version:
+            self.prime(available_agents, pool_version)
+        return self._cached_prep
 
     async def dispatch(
         self, 
         user_message: ChatMessage, 
         available_agents: List[AgentDefinition],
-        tracer: Optional[Tracer] = None  # JALON 4.1-B: Traçage optionnel
+        tracer: Optional[Tracer] = None,  # JALON 4.1-B: Traçage optionnel
+        pool_version: Optional[int] = None
     ) -> AgentDefinition:
         """
         Sélectionne l'agent approprié pour traiter la requête utilisateur
@@ -121,6 +255,8 @@ Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande de
             user_message: Message de l'utilisateur à analyser
             available_agents: Liste des agents disponibles pour la sélection
             tracer: Tracer optionnel pour l'observabilité (JALON 4.1-B)
+            pool_version: Version du pool d'agents pour réutiliser la préparation
+                         du routage (voir prime)
             
         Returns:
             AgentDefinition: L'agent sélectionné pour traiter la requête
@@ -140,7 +276,7 @@ Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande de
         # Si un seul agent, pas besoin de routage
         if len(available_agents) == 1:
             selected_agent = available_agents[0]
-            logger.info(f"Un seul agent disponible, sélection automatique: {selected_agent.agent_name}")
+            logger.info("Un seul agent disponible, sélection automatique: %s", selected_agent.agent_name)
             
             # JALON 4.1-B: Traçage de la décision automatique
             if tracer:
@@ -148,43 +284,114 @@ Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande de
             
             return selected_agent
         
-        logger.info(f"Routage en cours pour: '{user_message.content}' parmi {len(available_agents)} agents")
+        # Cache des décisions : évite l'appel LLM pour une requête déjà routée
+        cache_key = self._decision_cache_key(user_message.content, available_agents)
+        cached_agent = self._get_cached_decision(cache_key, available_agents)
+        if cached_agent is not None:
+            logger.info("Agent sélectionné depuis le cache: %s", cached_agent.agent_name)
+            if tracer:
+                await tracer.log_router_decision(cached_agent.agent_name)
+            return cached_agent
+        
+        # Coalescence : les requêtes identiques concurrentes partagent un seul routage
+        selected_agent, shared = await self._inflight.do(
+            cache_key,
+            lambda: self._route_with_llm(
+                user_message, available_agents, cache_key, tracer, pool_version
+            )
+        )
+        if shared:
+            logger.info("Agent sélectionné par un routage concurrent: %s", selected_agent.agent_name)
+            if tracer:
+                await tracer.log_router_decision(selected_agent.agent_name)
+        return selected_agent
+
+    async def _route_with_llm(
+        self,
+        user_message: ChatMessage,
+        available_agents: List[AgentDefinition],
+        cache_key: str,
+        tracer: Optional[Tracer],
+        pool_version: Optional[int]
+    ) -> AgentDefinition:
+        """
+        Effectue le routage via le LLM (ou l'heuristique) et alimente le cache
+        
+        Args:
+            user_message: Message de l'utilisateur à analyser
+            available_agents: Liste des agents disponibles pour la sélection
+            cache_key: Clé de cache de la décision
+            tracer: Tracer optionnel pour l'observabilité
+            pool_version: Version du pool d'agents
+            
+        Returns:
+            AgentDefinition: L'agent sélectionné (premier agent en cas d'erreur)
+        """
+        logger.info("Routage en cours pour: '%s' parmi %d agents", user_message.content, len(available_agents))
         
         try:
-            # Création de l'outil de sélection dynamique
-            selection_tool_schema = AgentSelectionTool.create_for_agents(available_agents)
+            # Message système et outil de sélection réutilisés par version du pool
+            system_message, selection_tool_schema = self._get_routing_prep(
+                available_agents, pool_version
+            )
             
-            # Messages pour le LLM de routage
+            # Messages pour le LLM de routage (seul le message utilisateur est construit)
             routing_messages = [
-                ChatMessage(role="system", content=self.router_system_prompt),
+                system_message,
                 ChatMessage(role="user", content=f"Requête à analyser: {user_message.content}")
             ]
             
-            # Appel du LLM de routage avec Function Calling
-            routing_request = OrchestrationRequest(
-                message="",  # Le message est déjà dans l'historique
-                agent_config=None,  # Utilise la config par défaut du routeur
-                conversation_history=routing_messages
-            )
-            
-            # Appel via orchestration_completion avec les outils
-            response = await self._call_router_llm_with_tools(
+            # Appel via orchestration_completion avec les outils, lancé en parallèle
+            # de l'heuristique locale par mots-clés
+            llm_task = asyncio.create_task(self._call_router_llm_with_tools(
                 routing_messages, 
                 [selection_tool_schema]
+            ))
+            
+            heuristic_agent, heuristic_confidence = self._heuristic_select(
+                user_message.content, available_agents
             )
+            heuristic_used = (
+                heuristic_agent is not None
+                and heuristic_confidence > self.heuristic_confidence_threshold
+            )
+            
+            if tracer and heuristic_agent is not None:
+                await tracer.log_step(
+                    component="AgentRouter",
+                    event="heuristic_decision",
+                    details={
+                        "heuristic_agent": heuristic_agent.agent_name,
+                        "heuristic_confidence": round(heuristic_confidence, 3),
+                        "used": heuristic_used
+                    }
+                )
+            
+            if heuristic_used:
+                # Décision heuristique suffisamment sûre : l'appel LLM est abandonné
+                llm_task.cancel()
+                selected_agent = heuristic_agent
+                logger.info(
+                    "Agent sélectionné par heuristique (%.2f): %s",
+                    heuristic_confidence, selected_agent.agent_name
+                )
+            else:
+                response = await llm_task
+                
+                # Parser la réponse et extraire l'agent sélectionné
+                selected_agent = self._extract_selected_agent(response, available_agents)
             
-            # Parser la réponse et extraire l'agent sélectionné
-            selected_agent = self._extract_selected_agent(response, available_agents)
+            self._store_decision(cache_key, selected_agent.agent_name)
             
             # JALON 4.1-B: Traçage de la décision finale
             if tracer:
                 await tracer.log_router_decision(selected_agent.agent_name)
             
-            logger.info(f"Agent sélectionné: {selected_agent.agent_name}")
+            logger.info("Agent sélectionné: %s", selected_agent.agent_name)
             return selected_agent
             
         except Exception as e:
-            logger.error(f"Erreur lors du routage: {str(e)}")
+            logger.error("Erreur lors du routage: %s", e)
             
             # JALON 4.1-B: Traçage de l'erreur
             if tracer:
@@ -192,7 +399,7 @@ Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande de
             
             # Fallback : retourner le premier agent disponible
             fallback_agent = available_agents[0]
-            logger.warning(f"Fallback vers le premier agent: {fallback_agent.agent_name}")
+            logger.warning("Fallback vers le premier agent: %s", fallback_agent.agent_name)
             
             # JALON 4.1-B: Traçage du fallback
             if tracer:
@@ -200,6 +407,111 @@ Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande de
             
             return fallback_agent
 
+    def _heuristic_select(
+        self,
+        message: str,
+        available_agents: List[AgentDefinition]
+    ) -> Tuple[Optional[AgentDefinition], float]:
+        """
+        Sélection rapide par recouvrement de mots-clés avec les descriptions
+        
+        Args:
+            message: Contenu du message utilisateur
+            available_agents: Agents disponibles
+            
+        Returns:
+            Tuple[Optional[AgentDefinition], float]: Meilleur agent et sa part du
+                score total (None, 0.0 si le meilleur agent a moins de
+                _HEURISTIC_MIN_MATCHES mots-clés ou ne devance pas le suivant
+                d'un facteur _HEURISTIC_MIN_MARGIN)
+        """
+        agents_key = tuple(
+            (agent.agent_name, agent.description) for agent in available_agents
+        )
+        index = _build_keyword_index(agents_key)
+        
+        scores: Dict[str, int] = {}
+        for token in set(_KEYWORD_PATTERN.findall(message.lower())):
+            for agent_name in index.get(token, ()):
+                scores[agent_name] = scores.get(agent_name, 0) + 1
+        
+        if not scores:
+            return None, 0.0
+        
+        ranked = sorted(scores.values(), reverse=True)
+        best_score = ranked[0]
+        runner_up = ranked[1] if len(ranked) > 1 else 0
+        if best_score < _HEURISTIC_MIN_MATCHES or best_score < _HEURISTIC_MIN_MARGIN * runner_up:
+            # Correspondance trop faible ou trop ambiguë : décision laissée au LLM
+            return None, 0.0
+        
+        best_name = max(scores, key=scores.get)
+        confidence = scores[best_name] / sum(scores.values())
+        for agent in available_agents:
+            if agent.agent_name == best_name:
+                return agent, confidence
+        return None, 0.0
+
+    def _decision_cache_key(self, message: str, available_agents: List[AgentDefinition]) -> str:
+        """
+        Calcule la clé de cache d'une décision de routage
+        
+        Args:
+            message: Contenu du message utilisateur
+            available_agents: Agents disponibles (le choix dépend du pool)
+            
+        Returns:
+            str: Empreinte du message normalisé et des noms d'agents
+        """
+        normalized = " ".join(message.lower().split())
+        agent_names = ",".join(sorted(agent.agent_name for agent in available_agents))
+        return hashlib.blake2b(
+            f"{normalized}|{agent_names}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def _get_cached_decision(
+        self,
+        cache_key: str,
+        available_agents: List[AgentDefinition]
+    ) -> Optional[AgentDefinition]:
+        """
+        Recherche une décision de routage encore valide dans le cache
+        
+        Args:
+            cache_key: Clé calculée par _decision_cache_key
+            available_agents: Agents disponibles
+            
+        Returns:
+            Optional[AgentDefinition]: Agent en cache, None si absent ou expiré
+        """
+        entry = self._decision_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        stored_at, agent_name = entry
+        if time.monotonic() - stored_at > self.decision_cache_ttl:
+            del self._decision_cache[cache_key]
+            return None
+        
+        for agent in available_agents:
+            if agent.agent_name == agent_name:
+                self._decision_cache.move_to_end(cache_key)
+                return agent
+        return None
+
+    def _store_decision(self, cache_key: str, agent_name: str) -> None:
+        """
+        Enregistre une décision de routage avec éviction LRU
+        
+        Args:
+            cache_key: Clé calculée par _decision_cache_key
+            agent_name: Nom de l'agent sélectionné
+        """
+        self._decision_cache[cache_key] = (time.monotonic(), agent_name)
+        self._decision_cache.move_to_end(cache_key)
+        while len(self._decision_cache) > self.decision_cache_size:
+            self._decision_cache.popitem(last=False)
+
     async def _call_router_llm_with_tools(
         self, 
         messages: List[ChatMessage], 
@@ -257,28 +569,38 @@ Si la requête est ambiguë, choisis l'agent le plus généraliste ou demande de
         Raises:
             Exception: Si aucun agent valide n'est trouvé dans la réponse
         """
+        # Index des agents par nom (recherche O(1) au lieu d'un parcours par tool call)
+        by_name = {agent.agent_name: agent for agent in available_agents}
+        
         # Recherche d'un appel à select_agent dans les tool_calls
         if response.tool_calls:
             for tool_call in response.tool_calls:
                 if tool_call.tool_name == "select_agent":
-                    selected_name = tool_call.arguments.get("agent_name")
-                    reasoning = tool_call.arguments.get("reasoning", "Non spécifié")
+                    args = tool_call.arguments
+                    try:
+                        # Certains fournisseurs renvoient les arguments sous forme de JSON brut
+                        if isinstance(args, (str, bytes)):
+                            args = json_codec.loads(args)
+                        selected_name = args["agent_name"]
+                    except (json_codec.JSONDecodeError, KeyError, TypeError):
+                        logger.warning("Arguments de select_agent invalides ou sans agent_name")
+                        continue
+                    reasoning = args.get("reasoning", "Non spécifié")
                     
                     # Recherche de l'agent correspondant
-                    for agent in available_agents:
-                        if agent.agent_name == selected_name:
-                            logger.info(f"Agent sélectionné via tool call: {selected_name}")
-                            logger.info(f"Raisonnement: {reasoning}")
-                            return agent
+                    if (agent := by_name.get(selected_name)) is not None:
+                        logger.info("Agent sélectionné via tool call: %s", selected_name)
+                        logger.info("Raisonnement: %s", reasoning)
+                        return agent
                     
-                    logger.warning(f"Agent demandé non trouvé: {selected_name}")
+                    logger.warning("Agent demandé non trouvé: %s", selected_name)
         
         # Fallback: analyse du contenu textuel pour extraire un nom d'agent
         if response.content:
             content_lower = response.content.lower()
-            for agent in available_agents:
-                if agent.agent_name.lower() in content_lower:
-                    logger.info(f"Agent détecté dans le contenu: {agent.agent_name}")
+            for name, agent in by_name.items():
+                if content_lower.find(name.lower()) != -1:
+                    logger.info("Agent détecté dans le contenu: %s", agent.agent_name)
                     return agent
         
         # Dernier fallback: premier agent disponible
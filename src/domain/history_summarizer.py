@@ -5,9 +5,11 @@ Ce module implémente la logique de synthèse automatique des conversations long
 pour maintenir une mémoire à long terme efficace tout en préservant les performances.
 """
 
+import copy
+import io
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple, Type
 from src.domain.llm_service_interface import LLMServiceInterface
 from src.domain.llm_service_factory import LLMServiceFactory
 from src.domain.tracer import Tracer  # JALON 4.1-B: Intégration du traçage
@@ -17,13 +19,20 @@ from src.models.data_contracts import (
     ChatMessage,
     AgentConfig,
     OrchestrationRequest,
-    SessionManager
+    SessionManager,
+    SUMMARY_MARKER
 )
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Préfixes d'affichage par rôle pour le prompt de synthèse
+ROLE_PREFIX = {
+    "user": "👤 USER",
+    "assistant": "🤖 ASSISTANT",
+    "system": "⚙️ SYSTEM",
+    "tool": "🔧 TOOL"
+}
+
 
 class HistorySummarizer:
     """
@@ -34,14 +43,39 @@ class HistorySummarizer:
     l'historique long par un résumé concis.
     """
     
-    def __init__(self, session_manager: SessionManager):
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        llm_factory: Optional[Type[LLMServiceFactory]] = None
+    ):
         """
         Initialise le service de synthèse
         
         Args:
             session_manager: Manager pour la persistance des sessions
+            llm_factory: Factory des services LLM (LLMServiceFactory par défaut)
         """
         self.session_manager = session_manager
+        self.llm_factory = llm_factory or LLMServiceFactory
+        
+        # Services de synthèse déjà résolus, par fournisseur
+        self._summarizer_services: Dict[str, LLMServiceInterface] = {}
+    
+    def _get_summarizer(self, provider: str) -> LLMServiceInterface:
+        """
+        Retourne le service LLM de synthèse pour un fournisseur (mémoïsé)
+        
+        Args:
+            provider: Fournisseur LLM configuré pour la synthèse
+            
+        Returns:
+            LLMServiceInterface: Service de synthèse
+        """
+        service = self._summarizer_services.get(provider)
+        if service is None:
+            service = self.llm_factory.create_service(provider)
+            self._summarizer_services[provider] = service
+        return service
     
     async def summarize_if_needed(self, session: Session, tracer: Optional[Tracer] = None) -> Session:
         """
@@ -61,18 +95,17 @@ class HistorySummarizer:
             Session: Session mise à jour (synthétisée ou inchangée)
         """
         if not session.history_config.enabled:
-            logger.debug(f"Synthèse désactivée pour session {session.session_id}")
+            logger.debug("Synthèse désactivée pour session %s", session.session_id)
             return session
         
-        # Vérification des seuils
-        if not session.should_trigger_summarization():
-            logger.debug(f"Seuils non atteints pour session {session.session_id}")
+        # Calcul des métriques et vérification des seuils en un seul parcours
+        metrics, should_trigger = session.get_history_metrics_and_check()
+        if not should_trigger:
+            logger.debug("Seuils non atteints pour session %s", session.session_id)
             return session
         
-        # Calcul des métriques pour le logging
-        metrics = session.get_history_metrics()
-        logger.info(f"Déclenchement synthèse pour session {session.session_id}")
-        logger.info(f"Métriques: {metrics}")
+        logger.info("Déclenchement synthèse pour session %s", session.session_id)
+        logger.info("Métriques: %s", metrics)
         
         # JALON 4.1-B: Traçage du début de synthèse
         if tracer:
@@ -82,7 +115,7 @@ class HistorySummarizer:
                 details={
                     "session_id": session.session_id,
                     "messages_count": metrics['messages'],
-                    "tokens_count": metrics['tokens']
+                    "tokens_count": metrics['estimated_tokens']
                 }
             )
         
@@ -91,7 +124,7 @@ class HistorySummarizer:
             summary_message = await self._create_summary(session, tracer)
             
             # Préservation du dernier message utilisateur
-            last_user_message = self._get_last_user_message(session.history)
+            last_user_message = session.get_last_user_message()
             
             # Remplacement de l'historique
             new_history = [summary_message]
@@ -99,13 +132,12 @@ class HistorySummarizer:
                 new_history.append(last_user_message)
             
             session.history = new_history
-            session.updated_at = datetime.now().isoformat()
             
             # Sauvegarde de la session mise à jour
             await self.session_manager.save_session(session)
             
-            logger.info(f"Synthèse réussie pour session {session.session_id}")
-            logger.info(f"Historique réduit de {metrics['messages']} à {len(new_history)} messages")
+            logger.info("Synthèse réussie pour session %s", session.session_id)
+            logger.info("Historique réduit de %d à %d messages", metrics['messages'], len(new_history))
             
             # JALON 4.1-B: Traçage de la synthèse réussie
             if tracer:
@@ -123,7 +155,7 @@ class HistorySummarizer:
             return session
             
         except Exception as e:
-            logger.error(f"Erreur lors de la synthèse pour session {session.session_id}: {str(e)}")
+            logger.error("Erreur lors de la synthèse pour session %s: %s", session.session_id, e)
             
             # JALON 4.1-B: Traçage des erreurs de synthèse
             if tracer:
@@ -149,23 +181,23 @@ class HistorySummarizer:
             Exception: En cas d'erreur lors de l'appel au LLM
         """
         # Création du service LLM de synthèse
-        summarizer_service = LLMServiceFactory.create_service(
-            session.history_config.llm_provider
-        )
+        summarizer_service = self._get_summarizer(session.history_config.llm_provider)
         
-        # Construction du prompt de synthèse
-        history_text = self._format_history_for_summary(session.history)
+        # L'historique est transmis tel quel sous forme de messages (pas de prompt
+        # géant à matérialiser), suivi de la consigne de synthèse
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Historique à synthétiser:\n%s",
+                self._format_history_for_summary(session.history)
+            )
         
         summary_messages = [
             ChatMessage(
                 role="system", 
                 content=session.history_config.system_prompt
-            ),
-            ChatMessage(
-                role="user",
-                content=f"Voici l'historique de conversation à synthétiser :\n\n{history_text}\n\nCrée un résumé concis qui préserve le contexte essentiel pour la suite de la conversation."
             )
         ]
+        summary_messages.extend(session.history)
         
         # Configuration pour la synthèse
         summary_config = AgentConfig(
@@ -179,7 +211,7 @@ class HistorySummarizer:
         
         # Requête de synthèse
         summary_request = OrchestrationRequest(
-            message="",  # Message vide, tout est dans l'historique
+            message="Résume la conversation ci-dessus de manière concise en préservant le contexte essentiel pour la suite de la conversation.",
             agent_config=summary_config,
             conversation_history=summary_messages
         )
@@ -193,7 +225,7 @@ class HistorySummarizer:
         # Création du message de résumé
         summary_message = ChatMessage(
             role="assistant",
-            content=f"[RÉSUMÉ AUTOMATIQUE] {response.content}"
+            content=f"{SUMMARY_MARKER} {response.content}"
         )
         
         return summary_message
@@ -211,65 +243,89 @@ class HistorySummarizer:
         if not history:
             return "Aucun historique disponible."
         
-        formatted_lines = []
+        buffer = io.StringIO()
         for i, message in enumerate(history, 1):
-            role_emoji = {
-                "user": "👤",
-                "assistant": "🤖", 
-                "system": "⚙️",
-                "tool": "🔧"
-            }.get(message.role, "❓")
-            
-            content = message.content or "[Contenu vide]"
-            formatted_lines.append(f"{i}. {role_emoji} {message.role.upper()}: {content}")
-        
-        return "\n".join(formatted_lines)
-    
-    def _get_last_user_message(self, history: list[ChatMessage]) -> Optional[ChatMessage]:
-        """
-        Récupère le dernier message utilisateur de l'historique
+            prefix = ROLE_PREFIX.get(message.role)
+            if prefix is None:
+                prefix = f"❓ {message.role.upper()}"
+            if i > 1:
+                buffer.write("\n")
+            buffer.write(f"{i}. {prefix}: {message.content or '[Contenu vide]'}")
         
-        Args:
-            history: Historique de conversation
-            
-        Returns:
-            Optional[ChatMessage]: Dernier message utilisateur ou None
-        """
-        # Parcours en sens inverse pour trouver le dernier message utilisateur
-        for message in reversed(history):
-            if message.role == "user":
-                return message
-        return None
+        return buffer.getvalue()
     
     def get_summarization_stats(self, session: Session) -> Dict[str, Any]:
         """
         Calcule des statistiques sur l'état de synthèse d'une session
         
+        Les métriques et la présence d'un résumé sont maintenues
+        incrémentalement par la session ; le dictionnaire construit pour ces
+        valeurs est mis en cache et chaque appelant en reçoit une copie.
+        
         Args:
             session: Session à analyser
             
         Returns:
-            Dict: Statistiques de synthèse
+            Dict: Statistiques de synthèse (copie modifiable)
         """
-        metrics = session.get_history_metrics()
+        metrics, should_summarize = session.get_history_metrics_and_check()
         config = session.history_config
         
-        return {
-            "session_id": str(session.session_id),
-            "summarization_enabled": config.enabled,
-            "current_metrics": metrics,
-            "thresholds": {
-                "messages": config.message_threshold,
-                "chars": config.char_threshold, 
-                "words": config.word_threshold,
-                "tokens": config.token_threshold
-            },
-            "threshold_status": {
-                "messages": f"{metrics['messages']}/{config.message_threshold} ({'✅' if metrics['messages'] >= config.message_threshold else '⏳'})",
-                "chars": f"{metrics['chars']}/{config.char_threshold} ({'✅' if metrics['chars'] >= config.char_threshold else '⏳'})",
-                "words": f"{metrics['words']}/{config.word_threshold} ({'✅' if metrics['words'] >= config.word_threshold else '⏳'})",
-                "tokens": f"{metrics['estimated_tokens']}/{config.token_threshold} ({'✅' if metrics['estimated_tokens'] >= config.token_threshold else '⏳'})"
-            },
-            "should_summarize": session.should_trigger_summarization(),
-            "has_summary": any("[RÉSUMÉ AUTOMATIQUE]" in (msg.content or "") for msg in session.history)
-        }
\ No newline at end of file
+        return copy.deepcopy(_summarization_stats(
+            str(session.session_id),
+            (metrics['messages'], metrics['chars'], metrics['words'], metrics['estimated_tokens']),
+            (config.enabled, config.message_threshold, config.char_threshold,
+             config.word_threshold, config.token_threshold),
+            should_summarize,
+            session.has_summary()
+        ))
+
+
+@lru_cache(maxsize=1024)
+def _summarization_stats(
+    session_id: str,
+    metrics: Tuple[int, int, int, int],
+    thresholds: Tuple[bool, int, int, int, int],
+    should_summarize: bool,
+    has_summary: bool
+) -> Dict[str, Any]:
+    """
+    Construit le dictionnaire de statistiques de synthèse (mis en cache, partagé)
+    
+    Args:
+        session_id: Identifiant de la session
+        metrics: (messages, chars, words, estimated_tokens)
+        thresholds: (enabled, messages, chars, words, tokens) de la configuration
+        should_summarize: Résultat de la vérification des seuils
+        has_summary: Présence d'un résumé automatique dans l'historique
+        
+    Returns:
+        Dict: Statistiques de synthèse
+    """
+    messages, chars, words, estimated_tokens = metrics
+    enabled, message_threshold, char_threshold, word_threshold, token_threshold = thresholds
+    
+    return {
+        "session_id": session_id,
+        "summarization_enabled": enabled,
+        "current_metrics": {
+            "messages": messages,
+            "chars": chars,
+            "words": words,
+            "estimated_tokens": estimated_tokens
+        },
+        "thresholds": {
+            "messages": message_threshold,
+            "chars": char_threshold, 
+            "words": word_threshold,
+            "tokens": token_threshold
+        },
+        "threshold_status": {
+            "messages": f"{messages}/{message_threshold} ({'✅' if messages >= message_threshold else '⏳'})",
+            "chars": f"{chars}/{char_threshold} ({'✅' if chars >= char_threshold else '⏳'})",
+            "words": f"{words}/{word_threshold} ({'✅' if words >= word_threshold else '⏳'})",
+            "tokens": f"{estimated_tokens}/{token_threshold} ({'✅' if estimated_tokens >= token_threshold else '⏳'})"
+        },
+        "should_summarize": should_summarize,
+        "has_summary": has_summary
+    }
@@ -0,0 +1,370 @@
+"""
+Cache des Réponses LLM
+
+Ce module implémente un cache des réponses d'orchestration pour les requêtes
+déterministes (température nulle). Les requêtes sont hachées telles quelles en
+SHA-256 : la casse et les espaces font partie du prompt et changent la réponse.
+
+Le stockage est délégué à un backend interchangeable : en mémoire (par défaut)
+ou Redis (si le paquet redis est installé).
+
+Le décorateur cached_chat_completion applique le même cache aux appels
+chat_completion des adaptateurs (température basse, appels sans outils).
+"""
+
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Protocol, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from src.domain.singleflight import SingleFlight
+from src.infrastructure import json_codec
+from src.infrastructure.monitoring import get_metrics_collector
+from src.models.data_contracts import (
+    AgentConfig,
+    ChatMessage,
+    ChatResponse,
+    OrchestrationRequest,
+    OrchestrationResponse,
+    ToolDefinition
+)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis est optionnel
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Température maximale d'un appel chat_completion pour que sa réponse soit mise en cache
+CHAT_CACHE_MAX_TEMPERATURE = 0.3
+
+# Durée de validité des réponses chat_completion en cache (secondes)
+CHAT_CACHE_TTL_SECONDS = 1800.0
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+
+def is_cacheable(config: AgentConfig) -> bool:
+    """
+    Indique si les réponses pour cette configuration peuvent être mises en cache
+
+    Seules les requêtes déterministes (température nulle) sont concernées.
+
+    Args:
+        config: Configuration de l'agent
+
+    Returns:
+        bool: True si la réponse est déterministe
+    """
+    return config.temperature == 0
+
+
+class CacheBackend(Protocol):
+    """Interface de stockage des entrées du cache (valeurs sérialisées)"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    async def clear(self) -> None:
+        ...
+
+
+class InMemoryCacheBackend:
+    """
+    Backend en mémoire du processus (LRU avec expiration)
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Nombre maximal d'entrées conservées (éviction LRU)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Backend Redis, partagé entre processus et instances de l'application
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "llm_cache:"):
+        """
+        Args:
+            url: URL de connexion Redis
+            prefix: Préfixe des clés du cache
+
+        Raises:
+            ImportError: Si le paquet redis n'est pas installé
+        """
+        if aioredis is None:
+            raise ImportError("Le paquet 'redis' est requis pour RedisCacheBackend")
+        self.prefix = prefix
+        self._client = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+
+class LLMCache:
+    """
+    Cache des réponses d'orchestration déterministes
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl_seconds: float = 3600.0):
+        """
+        Initialise le cache
+
+        Args:
+            backend: Stockage des entrées (en mémoire par défaut)
+            ttl_seconds: Durée de validité par défaut d'une entrée (secondes)
+        """
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._metrics_collector = None
+
+    @staticmethod
+    def make_key(config: AgentConfig, request: OrchestrationRequest) -> str:
+        """
+        Calcule la clé de cache d'une requête
+
+        Args:
+            config: Configuration de l'agent (fournisseur, modèle, paramètres)
+            request: Requête d'orchestration
+
+        Returns:
+            str: Empreinte SHA-256 de la requête
+        """
+        payload = [
+            config.provider.value if config.provider else None,
+            config.model_version,
+            config.max_tokens,
+            config.system_prompt,
+            sorted(config.available_tools) if config.tools_enabled else None,
+            [(msg.role, msg.content) for msg in request.conversation_history],
+            request.message
+        ]
+        return hashlib.sha256(json_codec.dumps_bytes(payload)).hexdigest()
+
+    @staticmethod
+    def make_chat_key(
+        provider: str,
+        model_version: str,
+        messages: List[ChatMessage],
+        max_tokens: Optional[int],
+        temperature: Optional[float]
+    ) -> str:
+        """
+        Calcule la clé de cache d'un appel chat_completion
+
+        Args:
+            provider: Nom du fournisseur
+            model_version: Modèle demandé
+            messages: Messages envoyés
+            max_tokens: Limite de tokens
+            temperature: Température de génération
+
+        Returns:
+            str: Empreinte SHA-256 de l'appel
+        """
+        payload = [
+            "chat",
+            provider,
+            model_version,
+            max_tokens,
+            temperature,
+            [(msg.role, msg.content) for msg in messages]
+        ]
+        return hashlib.sha256(json_codec.dumps_bytes(payload)).hexdigest()
+
+    async def get(
+        self,
+        key: str,
+        response_type: Type[ResponseT] = OrchestrationResponse
+    ) -> Optional[ResponseT]:
+        """
+        Retourne la réponse en cache si elle est encore valide
+
+        Chaque appel reconstruit une nouvelle instance : l'appelant peut la modifier.
+
+        Args:
+            key: Clé calculée par make_key ou make_chat_key
+            response_type: Modèle de la réponse stockée (OrchestrationResponse par défaut)
+
+        Returns:
+            Optional[ResponseT]: Réponse en cache ou None
+        """
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            # Un cache indisponible ne doit jamais faire échouer l'appel LLM
+            logger.warning("Lecture du cache LLM impossible: %s", e)
+            value = None
+
+        response = None
+        if value is not None:
+            try:
+                response = response_type.model_validate_json(value)
+            except ValidationError as e:
+                # Entrée corrompue ou d'un ancien format : traitée comme absente
+                logger.warning("Entrée du cache LLM illisible, ignorée: %s", e)
+
+        self._record_lookup(response is not None)
+        return response
+
+    async def set(
+        self,
+        key: str,
+        response: BaseModel,
+        ttl: Optional[float] = None
+    ) -> None:
+        """
+        Enregistre une réponse dans le cache
+
+        Args:
+            key: Clé calculée par make_key ou make_chat_key
+            response: Réponse à mettre en cache
+            ttl: Durée de validité (ttl_seconds par défaut)
+        """
+        try:
+            await self.backend.set(
+                key,
+                response.model_dump_json().encode("utf-8"),
+                ttl if ttl is not None else self.ttl_seconds
+            )
+        except Exception as e:
+            logger.warning("Écriture du cache LLM impossible: %s", e)
+
+    async def clear(self) -> None:
+        """Vide le cache et remet les statistiques à zéro"""
+        await self.backend.clear()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _record_lookup(self, hit: bool) -> None:
+        """
+        Met à jour les statistiques et la métrique Prometheus d'une consultation
+
+        Args:
+            hit: True si la réponse a été trouvée
+        """
+        self.stats["hits" if hit else "misses"] += 1
+        try:
+            if self._metrics_collector is None:
+                self._metrics_collector = get_metrics_collector()
+            self._metrics_collector.record_cache_lookup(hit)
+        except Exception as e:
+            logger.warning("Failed to record cache metrics: %s", e)
+
+
+# Cache partagé par défaut (les services résilients sont créés par orchestration)
+_default_cache: Optional[LLMCache] = None
+
+
+def get_default_cache() -> LLMCache:
+    """
+    Retourne le cache de réponses partagé du processus
+
+    Returns:
+        LLMCache: Instance partagée
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+    return _default_cache
+
+
+# Appels chat_completion cachables en cours, par clé du cache
+_in_flight_chats: SingleFlight[ChatResponse] = SingleFlight()
+
+
+def cached_chat_completion(func):
+    """
+    Décorateur de chat_completion : sert les appels répétés depuis le cache partagé
+
+    Seuls les appels de température explicite au plus CHAT_CACHE_MAX_TEMPERATURE
+    sont mis en cache, pour CHAT_CACHE_TTL_SECONDS. Les appels avec outils ne le
+    sont jamais : les appels d'outils de la réponse ne sont pas rejouables. Les
+    appels identiques concurrents partagent un seul appel au fournisseur ; les
+    réponses rejouées ou partagées n'ont pas d'usage (tokens déjà comptés).
+
+    Args:
+        func: Méthode chat_completion d'un adaptateur LLM
+
+    Returns:
+        Méthode enveloppée
+    """
+    @functools.wraps(func)
+    async def wrapper(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        tools: Optional[List[ToolDefinition]] = None
+    ) -> ChatResponse:
+        if tools or temperature is None or temperature > CHAT_CACHE_MAX_TEMPERATURE:
+            return await func(self, messages, model_version, max_tokens, temperature, tools)
+
+        cache = get_default_cache()
+        key = cache.make_chat_key(
+            self.get_provider_name(), model_version, messages, max_tokens, temperature
+        )
+        cached_response = await cache.get(key, ChatResponse)
+        if cached_response is not None:
+            # Aucun token consommé : l'usage d'origine serait compté deux fois
+            cached_response.usage = None
+            return cached_response
+
+        async def call_and_store() -> ChatResponse:
+            response = await func(self, messages, model_version, max_tokens, temperature, None)
+            await cache.set(key, response, CHAT_CACHE_TTL_SECONDS)
+            return response
+
+        # Coalescence : un appel identique en cours est attendu plutôt que relancé
+        response, shared = await _in_flight_chats.do(key, call_and_store)
+        if shared:
+            return response.model_copy(update={"usage": None}, deep=True)
+        return response
+
+    return wrapper
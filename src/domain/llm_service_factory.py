@@ -1,7 +1,10 @@
 """Factory Pattern pour les Services LLM"""
 
-from typing import Dict, Type, Optional
+import threading
+import time
+from typing import Dict, Type, Optional, Tuple
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.infrastructure import json_codec
 from src.infrastructure.llm_providers.openai_adapter import OpenAIAdapter
 from src.infrastructure.llm_providers.gemini_adapter import GeminiAdapter
 from src.infrastructure.llm_providers.anthropic_adapter import AnthropicAdapter
@@ -28,8 +31,15 @@ class LLMServiceFactory:
         LLMProvider.QWEN.value: QwenAdapter,
     }
 
-    # Cache des instances créées
-    _instances: Dict[str, LLMServiceInterface] = {}
+    # Cache des instances créées, indexé par (provider, kwargs sérialisés canoniquement)
+    _instances: Dict[Tuple[str, bytes], LLMServiceInterface] = {}
+
+    # Verrou protégeant la création des instances entre threads
+    _lock = threading.Lock()
+
+    # Cache des informations fournisseurs : nom -> (horodatage, infos)
+    _info_cache: Dict[str, Tuple[float, Dict]] = {}
+    _info_cache_ttl: float = 30.0
 
     @classmethod
     def create_service(
@@ -56,21 +66,40 @@ class LLMServiceFactory:
             available = list(self._providers.keys())
             raise ValueError(f"Provider '{provider}' not supported. Available: {available}")
 
-        # Vérification du cache
-        cache_key = f"{provider}_{hash(frozenset(kwargs.items()))}"
-        if use_cache and cache_key in self._instances:
-            return self._instances[cache_key]
-
-        # Création de l'instance
         adapter_class = self._providers[provider]
-        instance = adapter_class(**kwargs)
+        if not use_cache:
+            return adapter_class(**kwargs)
+
+        # Vérification du cache sans verrou, puis sous verrou (double-checked locking)
+        cache_key = (provider, self._canonical_kwargs(kwargs))
+        instance = self._instances.get(cache_key)
+        if instance is not None:
+            return instance
 
-        # Mise en cache
-        if use_cache:
-            self._instances[cache_key] = instance
+        with self._lock:
+            instance = self._instances.get(cache_key)
+            if instance is None:
+                instance = adapter_class(**kwargs)
+                self._instances[cache_key] = instance
 
         return instance
 
+    @staticmethod
+    def _canonical_kwargs(kwargs: Dict) -> bytes:
+        """
+        Sérialise les kwargs de manière canonique pour la clé de cache
+        
+        Args:
+            kwargs: Arguments d'initialisation du service
+            
+        Returns:
+            bytes: Représentation JSON triée (constante si aucun argument)
+        """
+        if not kwargs:
+            # Cas le plus courant : aucun argument, pas de sérialisation
+            return b"{}"
+        return json_codec.dumps_bytes(kwargs, sort_keys=True)
+
     @classmethod
     def get_default_service(self, **kwargs) -> LLMServiceInterface:
         """
@@ -112,31 +141,44 @@ class LLMServiceFactory:
     @classmethod
     def clear_cache(self) -> None:
         """Vide le cache des instances"""
-        self._instances.clear()
+        with self._lock:
+            self._instances.clear()
+            self._info_cache.clear()
 
     @classmethod
     def get_provider_info(self) -> Dict[str, Dict]:
         """
         Retourne les informations sur tous les fournisseurs
         
+        Les informations sont mises en cache pendant _info_cache_ttl secondes et
+        s'appuient sur les instances du cache plutôt que sur des instances temporaires.
+        
         Returns:
             Dict: Informations détaillées des fournisseurs
         """
         info = {}
+        now = time.monotonic()
         for name, adapter_class in self._providers.items():
+            cached = self._info_cache.get(name)
+            if cached is not None and now - cached[0] < self._info_cache_ttl:
+                info[name] = cached[1]
+                continue
+
             try:
-                # Créer une instance temporaire pour obtenir les infos
-                temp_instance = adapter_class()
-                info[name] = {
-                    "available_models": temp_instance.get_available_models(),
-                    "is_healthy": temp_instance.is_healthy(),
+                # Réutilise (ou crée et met en cache) l'instance par défaut du fournisseur
+                instance = self.create_service(name)
+                provider_info = {
+                    "available_models": instance.get_available_models(),
+                    "is_healthy": instance.is_healthy(),
                     "class": adapter_class.__name__
                 }
             except Exception:
-                info[name] = {
+                provider_info = {
                     "available_models": [],
                     "is_healthy": False,
                     "class": adapter_class.__name__,
                     "error": "Failed to initialize"
                 }
+            self._info_cache[name] = (now, provider_info)
+            info[name] = provider_info
         return info
\ No newline at end of file
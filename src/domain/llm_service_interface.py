@@ -1,10 +1,15 @@
 """Interface LLM Service - Contrat pour tous les fournisseurs LLM"""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Union
 from src.models.data_contracts import ChatMessage, ChatResponse, OrchestrationRequest, OrchestrationResponse
 
 
+# Nombre maximal d'appels simultanés lancés par les méthodes de traitement par lot
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
 class LLMServiceInterface(ABC):
     """Interface abstraite pour tous les services LLM"""
 
@@ -33,6 +38,112 @@ class LLMServiceInterface(ABC):
         """
         pass
 
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming : le texte est transmis dès sa production
+        
+        Implémentation par défaut pour les fournisseurs sans streaming : la
+        réponse complète est transmise en un seul fragment.
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            
+        Yields:
+            str: Fragments de texte, dans l'ordre de génération
+        """
+        response = await self.chat_completion(
+            messages, model_version, max_tokens=max_tokens, temperature=temperature
+        )
+        if response.content:
+            yield response.content
+
+    async def chat_completion_batch(
+        self,
+        conversations: List[List[ChatMessage]],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False
+    ) -> List[Union[ChatResponse, BaseException]]:
+        """
+        Génère les réponses de plusieurs conversations en parallèle
+        
+        Les appels partagent le client HTTP (et ses connexions) de l'adaptateur ;
+        au plus max_concurrency appels sont en cours simultanément.
+        
+        Args:
+            conversations: Liste de conversations (une liste de messages chacune)
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            max_concurrency: Nombre maximal d'appels simultanés
+            return_exceptions: Si True, les erreurs sont retournées à la place des
+                réponses concernées au lieu d'interrompre le lot
+            
+        Returns:
+            List: Réponses (ou erreurs), dans l'ordre des conversations
+            
+        Raises:
+            Exception: Première erreur rencontrée si return_exceptions est False
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def complete(messages: List[ChatMessage]) -> ChatResponse:
+            async with semaphore:
+                return await self.chat_completion(
+                    messages, model_version, max_tokens=max_tokens, temperature=temperature
+                )
+        
+        return list(await asyncio.gather(
+            *(complete(messages) for messages in conversations),
+            return_exceptions=return_exceptions
+        ))
+
+    async def orchestration_completion_batch(
+        self,
+        requests: List[OrchestrationRequest],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False
+    ) -> List[Union[OrchestrationResponse, BaseException]]:
+        """
+        Traite plusieurs requêtes d'orchestration en parallèle
+        
+        Au plus max_concurrency appels sont en cours simultanément, ce qui borne
+        le débit envoyé au fournisseur (limites de requêtes par minute).
+        
+        Args:
+            requests: Requêtes d'orchestration à traiter
+            max_concurrency: Nombre maximal d'appels simultanés
+            return_exceptions: Si True, les erreurs sont retournées à la place des
+                réponses concernées au lieu d'interrompre le lot
+            
+        Returns:
+            List: Réponses (ou erreurs), dans l'ordre des requêtes
+            
+        Raises:
+            Exception: Première erreur rencontrée si return_exceptions est False
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def complete(request: OrchestrationRequest) -> OrchestrationResponse:
+            async with semaphore:
+                return await self.orchestration_completion(request)
+        
+        return list(await asyncio.gather(
+            *(complete(request) for request in requests),
+            return_exceptions=return_exceptions
+        ))
+
     @abstractmethod
     async def simple_completion(self, prompt: str, **kwargs) -> str:
         """
@@ -58,12 +169,12 @@ class LLMServiceInterface(ABC):
         pass
 
     @abstractmethod
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Sequence[str]:
         """
         Retourne la liste des modèles disponibles
         
         Returns:
-            List[str]: Liste des noms de modèles
+            Sequence[str]: Noms des modèles (séquence en lecture seule)
         """
         pass
 
@@ -8,24 +8,137 @@ avec backoff exponentiel configurable.
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any, Type
+import random
+import time
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Tuple, Type
 from datetime import datetime
 
 from src.domain.llm_service_interface import LLMServiceInterface
 from src.domain.llm_service_factory import LLMServiceFactory
+from src.domain.llm_cache import LLMCache, get_default_cache, is_cacheable
+from src.domain.singleflight import SingleFlight
 from src.domain.tracer import Tracer
 from src.models.data_contracts import (
     AgentConfig, 
+    LLMProvider,
     RetryConfig, 
     OrchestrationRequest, 
     OrchestrationResponse,
     AgentExecutionError
 )
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Messages d'erreur exposés à l'utilisateur, par type d'exception (lecture seule)
+_SAFE_MESSAGES = MappingProxyType({
+    "ConnectionError": "Erreur de connexion au service LLM",
+    "TimeoutError": "Délai d'attente dépassé pour le service LLM",
+    "HTTPException": "Erreur de communication avec le service LLM",
+    "ValueError": "Erreur de configuration ou de données",
+    "KeyError": "Erreur de configuration manquante",
+})
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur par fournisseur/modèle pour échouer rapidement quand un service est en panne
+    
+    États:
+    - CLOSED: les appels passent normalement
+    - OPEN: les appels échouent immédiatement pendant recovery_timeout secondes
+    - HALF_OPEN: un seul appel de test est autorisé; son résultat ferme ou rouvre le circuit
+    """
+    
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Nombre d'échecs définitifs consécutifs avant ouverture
+            recovery_timeout: Durée d'ouverture avant un appel de test (secondes)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self.in_flight_probe = False
+        self.probe_started_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def allow(self) -> bool:
+        """
+        Indique si un appel peut être tenté
+        
+        Returns:
+            bool: False si le circuit est ouvert (ou si un appel de test est déjà en cours)
+        """
+        if self.state == self.CLOSED:
+            return True
+        
+        async with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            
+            if self.state == self.HALF_OPEN:
+                # Un seul appel de test à la fois, les autres échouent immédiatement
+                # (un test abandonné, ex: annulation, est remplacé après recovery_timeout)
+                now = time.monotonic()
+                if self.in_flight_probe and now - self.probe_started_at < self.recovery_timeout:
+                    return False
+                self.in_flight_probe = True
+                self.probe_started_at = now
+            return True
+    
+    async def on_success(self) -> None:
+        """Réinitialise le compteur et ferme le circuit"""
+        async with self._lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self.in_flight_probe = False
+    
+    async def on_failure(self) -> None:
+        """Comptabilise un échec définitif et ouvre le circuit si le seuil est atteint"""
+        async with self._lock:
+            self.failure_count += 1
+            self.in_flight_probe = False
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+# Disjoncteurs partagés par (fournisseur, modèle)
+_circuit_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+# Services LLM partagés par fournisseur (clients HTTP et pools de connexions réutilisés)
+_service_pool: Dict[str, LLMServiceInterface] = {}
+
+# Appels déterministes en cours, par clé du cache de réponses
+_in_flight_requests: SingleFlight[OrchestrationResponse] = SingleFlight()
+
+
+def get_circuit_breaker(provider: str, model: str) -> CircuitBreaker:
+    """
+    Retourne le disjoncteur associé à un fournisseur et un modèle
+    
+    Args:
+        provider: Nom du fournisseur
+        model: Version du modèle
+        
+    Returns:
+        CircuitBreaker: Disjoncteur partagé
+    """
+    key = (provider, model)
+    breaker = _circuit_breakers.get(key)
+    if breaker is None:
+        breaker = _circuit_breakers[key] = CircuitBreaker()
+    return breaker
+
 
 class ResilientLLMService:
     """
@@ -39,16 +152,20 @@ class ResilientLLMService:
     - Backoff exponentiel: delay_base * (2 ** (attempt - 1))
     - Traçage de chaque tentative, délai et résultat
     - Gestion d'erreurs finales sécurisée
+    - Cache des réponses déterministes (température nulle)
+    - Requêtes couvertes vers des fournisseurs de repli (fallback_providers)
     """
     
-    def __init__(self, tracer: Optional[Tracer] = None):
+    def __init__(self, tracer: Optional[Tracer] = None, cache: Optional[LLMCache] = None):
         """
         Initialise le service résilient
         
         Args:
             tracer: Instance de tracer pour l'observabilité (optionnel)
+            cache: Cache des réponses (cache partagé du processus par défaut)
         """
         self.tracer = tracer
+        self.cache = cache if cache is not None else get_default_cache()
         
         # Définition des erreurs temporaires qui justifient un retry
         self.retriable_errors = (
@@ -56,8 +173,19 @@ class ResilientLLMService:
             ConnectionError,
             TimeoutError,
             # Erreurs HTTP temporaires (seront étendues selon les besoins)
-            Exception  # Pour l'instant, on considère toutes les exceptions comme retriables
+            Exception  # Toute exception non listée comme définitive ci-dessous
         )
+        
+        # Erreurs définitives : une nouvelle tentative échouerait de la même façon
+        self.non_retriable_errors = (ValueError, KeyError, TypeError)
+        self.non_retriable_error_names = frozenset({
+            # Erreurs client des SDK fournisseurs (identifiées par nom, sans import)
+            "AuthenticationError",
+            "PermissionDeniedError",
+            "BadRequestError",
+            "NotFoundError",
+            "UnprocessableEntityError"
+        })
     
     async def resilient_chat_completion(
         self, 
@@ -77,109 +205,333 @@ class ResilientLLMService:
         Raises:
             AgentExecutionError: Après épuisement des tentatives de retry
         """
+        # Cache des réponses déterministes : évite tout appel réseau sur un hit
+        cache_key = None
+        if is_cacheable(config):
+            cache_key = self.cache.make_key(config, request)
+            cached_response = await self.cache.get(cache_key)
+            if self.tracer:
+                await self.tracer.log_step(
+                    component="ResilientLLMService",
+                    event="cache_hit" if cached_response is not None else "cache_miss",
+                    details={
+                        "provider": config.provider.value if config.provider else "unknown",
+                        "model": config.model_version
+                    }
+                )
+            if cached_response is not None:
+                logger.info("⚡ Réponse LLM servie depuis le cache (%s)", config.provider.value)
+                return cached_response
+        
+        if cache_key is None:
+            return await self._call_with_retries(config, request, cache_key)
+        
+        # Coalescence : les requêtes identiques concurrentes partagent un seul appel
+        response, shared = await _in_flight_requests.do(
+            cache_key, lambda: self._call_with_retries(config, request, cache_key)
+        )
+        if shared:
+            logger.info("🔗 Résultat d'une requête identique partagé (%s)", config.provider.value)
+            return response.model_copy(deep=True)
+        return response
+    
+    async def _call_with_retries(
+        self,
+        config: AgentConfig,
+        request: OrchestrationRequest,
+        cache_key: Optional[str]
+    ) -> OrchestrationResponse:
+        """
+        Exécute la boucle de retry avec backoff derrière le disjoncteur
+        
+        Args:
+            config: Configuration d'agent incluant RetryConfig
+            request: Requête d'orchestration
+            cache_key: Clé du cache de réponses (None si la requête n'est pas cacheable)
+            
+        Returns:
+            Réponse d'orchestration réussie
+            
+        Raises:
+            AgentExecutionError: Circuit ouvert ou épuisement des tentatives
+        """
         retry_config = config.retry_config
+        max_attempts = retry_config.max_attempts
+        delay_base = retry_config.delay_base
+        max_delay = retry_config.max_delay
+        provider_name = config.provider.value if config.provider else "unknown"
+        tracer = self.tracer
         llm_service = None
         last_error = None
+        attempts_made = 0
         
-        for attempt in range(1, retry_config.max_attempts + 1):
+        # Disjoncteur : échec immédiat si le fournisseur est connu comme indisponible
+        breaker = get_circuit_breaker(provider_name, config.model_version)
+        if not await breaker.allow():
+            if tracer:
+                await tracer.log_step(
+                    component="ResilientLLMService",
+                    event="circuit_open",
+                    details={"provider": provider_name, "model": config.model_version}
+                )
+            logger.warning("🚫 Circuit ouvert pour %s/%s, appel ignoré", provider_name, config.model_version)
+            raise AgentExecutionError(
+                message=f"Service LLM temporairement indisponible ({provider_name}, circuit ouvert)",
+                attempts=0
+            )
+        
+        for attempt in range(1, max_attempts + 1):
+            attempts_made = attempt
             try:
                 # Traçage du début de tentative
-                if self.tracer:
-                    await self.tracer.log_step(
+                if tracer:
+                    await tracer.log_step(
                         component="ResilientLLMService",
                         event="retry_attempt_start",
                         details={
                             "attempt": attempt,
-                            "max_attempts": retry_config.max_attempts,
-                            "provider": config.provider.value if config.provider else "unknown"
+                            "max_attempts": max_attempts,
+                            "provider": provider_name
                         }
                     )
                 
-                # Création du service LLM pour cette tentative
+                # Service LLM mutualisé (créé une seule fois par fournisseur)
                 if llm_service is None:
-                    llm_service = LLMServiceFactory.create_service(config.provider)
+                    llm_service = self._get_or_create_service(config.provider)
                 
-                logger.info(f"🔄 Tentative {attempt}/{retry_config.max_attempts} - Appel LLM {config.provider.value}")
+                logger.info("🔄 Tentative %d/%d - Appel LLM %s", attempt, max_attempts, provider_name)
                 
-                # Appel LLM réel
-                response = await llm_service.orchestration_completion(request)
+                # Appel LLM réel (couvert par les fournisseurs de repli s'il tarde)
+                if config.fallback_providers:
+                    response = await self._hedged_completion(config, llm_service, request)
+                else:
+                    response = await llm_service.orchestration_completion(request)
                 
                 # Succès - Traçage et retour
-                if self.tracer:
-                    await self.tracer.log_step(
+                if tracer:
+                    await tracer.log_step(
                         component="ResilientLLMService",
                         event="llm_call_success",
                         details={
                             "attempt": attempt,
-                            "provider": config.provider.value if config.provider else "unknown",
+                            "provider": provider_name,
                             "response_length": len(response.content) if response.content else 0
                         }
                     )
                 
-                logger.info(f"✅ Appel LLM réussi à la tentative {attempt}")
+                logger.info("✅ Appel LLM réussi à la tentative %d", attempt)
+                await breaker.on_success()
+                if cache_key is not None:
+                    await self.cache.set(cache_key, response)
                 return response
                 
             except Exception as e:
                 last_error = e
-                logger.warning(f"⚠️ Échec tentative {attempt}/{retry_config.max_attempts}: {str(e)}")
+                # Message de l'erreur calculé une seule fois, et seulement s'il est utilisé
+                error_text = str(e) if tracer or logger.isEnabledFor(logging.WARNING) else ""
+                logger.warning("⚠️ Échec tentative %d/%d: %s", attempt, max_attempts, error_text)
                 
                 # Traçage de l'échec
-                if self.tracer:
-                    await self.tracer.log_step(
+                if tracer:
+                    await tracer.log_step(
                         component="ResilientLLMService",
                         event="retry_attempt_failed",
                         details={
                             "attempt": attempt,
                             "error_type": type(e).__name__,
-                            "error_message": str(e)[:200]  # Limiter la taille pour la sécurité
+                            "error_message": error_text[:200]  # Limiter la taille pour la sécurité
                         }
                     )
                 
+                # Erreur définitive : inutile d'épuiser le budget de tentatives
+                if not self.is_retriable_error(e):
+                    logger.warning("⛔ Erreur non retriable (%s), abandon immédiat", type(e).__name__)
+                    break
+                
                 # Si c'est la dernière tentative, ne pas attendre
-                if attempt >= retry_config.max_attempts:
+                if attempt >= max_attempts:
                     break
                 
-                # Calcul du délai de backoff exponentiel
-                delay = retry_config.delay_base * (2 ** (attempt - 1))
+                # Calcul du délai de backoff exponentiel plafonné, avec jitter
+                delay = min(max_delay, delay_base * (2 ** (attempt - 1))) * (0.5 + random.random())
                 
                 # Traçage du délai
-                if self.tracer:
-                    await self.tracer.log_step(
+                if tracer:
+                    await tracer.log_step(
                         component="ResilientLLMService",
                         event="retry_backoff_delay",
                         details={
                             "delay_seconds": delay,
                             "attempt": attempt,
-                            "backoff_formula": f"{retry_config.delay_base} * (2 ** {attempt - 1})"
+                            "backoff_formula": f"min({max_delay}, {delay_base} * (2 ** {attempt - 1})) * jitter"
                         }
                     )
                 
-                logger.info(f"⏳ Attente de {delay:.1f}s avant la tentative {attempt + 1}")
+                logger.info("⏳ Attente de %.1fs avant la tentative %d", delay, attempt + 1)
                 await asyncio.sleep(delay)
         
         # Toutes les tentatives ont échoué - Gestion d'erreur finale
-        error_message = self._create_safe_error_message(last_error, retry_config.max_attempts)
+        if last_error is not None and not self.is_retriable_error(last_error):
+            # Le fournisseur a répondu : l'erreur ne traduit pas une indisponibilité
+            await breaker.on_success()
+        else:
+            await breaker.on_failure()
+        error_message = self._create_safe_error_message(last_error, attempts_made)
         
         # Traçage de l'échec final
-        if self.tracer:
-            await self.tracer.log_step(
+        if tracer:
+            await tracer.log_step(
                 component="ResilientLLMService",
                 event="max_retries_exceeded",
                 details={
-                    "max_attempts": retry_config.max_attempts,
+                    "max_attempts": max_attempts,
                     "final_error_type": type(last_error).__name__ if last_error else "Unknown",
                     "safe_error_message": error_message
                 }
             )
         
-        logger.error(f"❌ Échec définitif après {retry_config.max_attempts} tentatives")
+        logger.error("❌ Échec définitif après %d tentatives", attempts_made)
         
         # Lever une exception sécurisée
         raise AgentExecutionError(
             message=error_message,
             original_error=last_error,
-            attempts=retry_config.max_attempts
+            attempts=attempts_made
+        )
+    
+    async def _hedged_completion(
+        self,
+        config: AgentConfig,
+        llm_service: LLMServiceInterface,
+        request: OrchestrationRequest
+    ) -> OrchestrationResponse:
+        """
+        Appel LLM couvert : si le fournisseur principal n'a pas répondu après
+        config.hedge_delay secondes, les fournisseurs de repli sont interrogés en
+        parallèle et la première réponse réussie l'emporte
+        
+        Args:
+            config: Configuration d'agent (fallback_providers, hedge_delay)
+            llm_service: Service du fournisseur principal
+            request: Requête d'orchestration
+            
+        Returns:
+            Première réponse réussie
+            
+        Raises:
+            Exception: Dernière erreur si tous les appels échouent
+        """
+        primary = asyncio.create_task(llm_service.orchestration_completion(request))
+        tasks = {primary: config.provider.value}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=config.hedge_delay)
+            if done:
+                return primary.result()
+            
+            for provider in config.fallback_providers:
+                if provider == config.provider:
+                    continue
+                try:
+                    service, fallback_request = self._prepare_fallback(provider, request)
+                except Exception as e:
+                    logger.warning("⚠️ Fournisseur de repli %s indisponible: %s", provider.value, e)
+                    continue
+                tasks[asyncio.create_task(service.orchestration_completion(fallback_request))] = provider.value
+            
+            logger.info(
+                "🏁 %s sans réponse après %.1fs, %d appel(s) de repli lancé(s)",
+                config.provider.value, config.hedge_delay, len(tasks) - 1
+            )
+            
+            pending = set(tasks)
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        last_error = error
+                        continue
+                    
+                    # Les appels perdants sont annulés : comptés en métrique, pas en erreur
+                    if self.tracer:
+                        await self.tracer.log_step(
+                            component="ResilientLLMService",
+                            event="hedge_resolved",
+                            details={
+                                "winner": tasks[task],
+                                "primary": config.provider.value,
+                                "cancelled": len(pending)
+                            }
+                        )
+                    return task.result()
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _prepare_fallback(
+        self,
+        provider: LLMProvider,
+        request: OrchestrationRequest
+    ) -> Tuple[LLMServiceInterface, OrchestrationRequest]:
+        """
+        Prépare le service et la requête pour un fournisseur de repli
+        
+        Le modèle demandé est conservé s'il est proposé par le fournisseur de repli,
+        sinon son modèle par défaut est utilisé.
+        
+        Args:
+            provider: Fournisseur de repli
+            request: Requête d'orchestration d'origine
+            
+        Returns:
+            Tuple (service, requête adaptée au fournisseur)
+        """
+        service = self._get_or_create_service(provider)
+        agent_config = request.agent_config or AgentConfig()
+        model_version = agent_config.model_version
+        if model_version not in service.get_available_models():
+            model_version = getattr(service, "default_model", None) or service.get_available_models()[0]
+        
+        fallback_config = agent_config.model_copy(
+            update={"provider": provider, "model_version": model_version, "fallback_providers": []}
         )
+        return service, request.model_copy(update={"agent_config": fallback_config})
+    
+    def _get_or_create_service(self, provider: str) -> LLMServiceInterface:
+        """
+        Retourne le service LLM mutualisé d'un fournisseur
+        
+        Args:
+            provider: Fournisseur LLM
+            
+        Returns:
+            LLMServiceInterface: Service partagé entre toutes les requêtes
+        """
+        service = _service_pool.get(provider)
+        if service is None:
+            service = _service_pool[provider] = LLMServiceFactory.create_service(provider)
+        return service
+    
+    @staticmethod
+    async def close() -> None:
+        """
+        Ferme les clients HTTP des services mutualisés (à appeler à l'arrêt de l'application)
+        """
+        for provider, service in list(_service_pool.items()):
+            client = getattr(service, "client", None)
+            close = getattr(client, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning("⚠️ Fermeture du client %s impossible: %s", provider, e)
+        _service_pool.clear()
     
     def _create_safe_error_message(self, error: Optional[Exception], attempts: int) -> str:
         """
@@ -195,18 +547,8 @@ class ResilientLLMService:
         if error is None:
             return f"Service LLM indisponible après {attempts} tentatives"
         
-        error_type = type(error).__name__
-        
         # Messages sécurisés selon le type d'erreur
-        safe_messages = {
-            "ConnectionError": "Erreur de connexion au service LLM",
-            "TimeoutError": "Délai d'attente dépassé pour le service LLM",
-            "HTTPException": "Erreur de communication avec le service LLM",
-            "ValueError": "Erreur de configuration ou de données",
-            "KeyError": "Erreur de configuration manquante",
-        }
-        
-        base_message = safe_messages.get(error_type, "Erreur technique du service LLM")
+        base_message = _SAFE_MESSAGES.get(type(error).__name__, "Erreur technique du service LLM")
         
         return f"{base_message} (après {attempts} tentatives)"
     
@@ -220,8 +562,10 @@ class ResilientLLMService:
         Returns:
             True si l'erreur est considérée comme temporaire
         """
-        # Pour l'instant, considérer la plupart des erreurs comme retriables
-        # À affiner selon les types d'erreurs spécifiques des APIs LLM
+        if isinstance(error, self.non_retriable_errors):
+            return False
+        if type(error).__name__ in self.non_retriable_error_names:
+            return False
         return isinstance(error, self.retriable_errors)
 
 
@@ -0,0 +1,68 @@
+"""
+Coalescence des appels asynchrones identiques (singleflight)
+
+Les appels concurrents portant la même clé partagent une seule exécution.
+Celle-ci tourne dans une tâche qui n'appartient à aucun appelant : l'annulation
+de l'un d'eux (y compris du premier) n'interrompt pas l'appel partagé et
+n'affecte pas les autres appelants en attente.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Registre des appels partagés en cours, par clé
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, "asyncio.Task[T]"] = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Exécute l'appel ou rejoint l'appel identique déjà en cours
+
+        Args:
+            key: Clé identifiant l'appel
+            call: Fabrique de la coroutine à exécuter (appelée seulement si aucun
+                  appel de même clé n'est en cours)
+
+        Returns:
+            Tuple[T, bool]: Résultat partagé (à copier avant toute modification)
+                et True si l'appel a été rejoint plutôt que lancé
+
+        Raises:
+            Exception: Exception levée par l'appel partagé
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # shield : l'annulation d'un appelant n'annule pas l'appel partagé
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: "asyncio.Task[T]") -> None:
+        """
+        Retire un appel terminé du registre
+
+        Args:
+            key: Clé de l'appel
+            task: Tâche terminée
+        """
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Marque l'exception comme consultée si plus aucun appelant n'attend
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Appel partagé %s terminé en erreur: %s", key, task.exception())
+
+    def __len__(self) -> int:
+        return len(self._tasks)
@@ -5,16 +5,33 @@ Ce module implémente le système de traçage léger mais complet pour rendre
 chaque cycle d'orchestration observable pour le débogage et l'analyse.
 """
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import re
+import time
+from collections import deque
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from uuid import UUID
 
-from src.models.data_contracts import TraceStep, SessionManager
+from src.models.data_contracts import Session, TraceStep, SessionManager
 from src.infrastructure.monitoring import get_metrics_collector  # JALON 4.3: Intégration métriques
 
 logger = logging.getLogger(__name__)
 
+# Regroupement des écritures de trace : taille maximale d'un lot et fenêtre d'attente
+TRACE_BATCH_SIZE = 32
+TRACE_BATCH_WINDOW_SECONDS = 0.05
+
+# Intervalle minimal entre deux sauvegardes de session par le Tracer
+TRACE_SAVE_INTERVAL_SECONDS = 0.5
+
+# Métriques issues des traces : enregistrées en différé par lots
+METRICS_DRAIN_INTERVAL_SECONDS = 0.1
+METRICS_BUFFER_MAX_SIZE = 10000
+
+# Noms de clés dont la valeur est masquée dans les logs (recherche insensible à la casse)
+_SENSITIVE_RE = re.compile(r'api[_-]?key|password|token|secret|credential', re.IGNORECASE)
+
 
 class Tracer:
     """
@@ -25,17 +42,39 @@ class Tracer:
     d'exécution : Router → Orchestrator → LLM → Tools → Response.
     """
     
-    def __init__(self, session_id: UUID, session_manager: SessionManager):
+    def __init__(
+        self, 
+        session_id: UUID, 
+        session_manager: SessionManager,
+        capture_prompt_length: bool = True
+    ):
         """
         Initialise le service de traçage pour une session donnée
         
         Args:
             session_id: UUID de la session à tracer
             session_manager: Manager pour la persistance des sessions
+            capture_prompt_length: Mesurer la taille des prompts envoyés aux LLM
+                (désactivable pour éviter le parcours de l'historique)
         """
         self.session_id = session_id
         self.session_manager = session_manager
+        self.capture_prompt_length = capture_prompt_length
         self.logger = logging.getLogger(f"{__name__}.{session_id}")
+        
+        # Collecteur de métriques résolu une fois pour toute la durée du tracer
+        self._metrics_collector = get_metrics_collector()
+        
+        # Persistance asynchrone : les étapes sont écrites par lots en arrière-plan
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # Session chargée une seule fois ; sauvegardée au plus une fois par intervalle
+        self._session_cache: Optional[Session] = None
+        self._dirty = False
+        self._last_save = 0.0
+        # Étapes ajoutées à la session depuis la dernière sauvegarde
+        self._pending_steps: List[TraceStep] = []
     
     async def log_step(
         self, 
@@ -47,56 +86,170 @@ class Tracer:
         Enregistre une étape de traçage dans la session
         
         Cette méthode constitue le cœur du système de traçabilité :
-        1. Récupère la session via le SessionManager
-        2. Crée un nouveau TraceStep avec horodatage
-        3. Ajoute l'étape à la trace de la session
-        4. Sauvegarde la session mise à jour
+        1. Crée un nouveau TraceStep avec horodatage
+        2. Le place dans la file d'écriture (persistance en arrière-plan, par lots)
+        3. Collecte les métriques associées
+        
+        La persistance dans la session est différée : appeler flush() pour
+        attendre que toutes les étapes soient enregistrées.
         
         Args:
             component: Nom du composant (Router/Orchestrator/LLM/etc.)
             event: Type d'événement (start/decision/call/response/error)
             details: Détails optionnels spécifiques à l'étape
-            
-        Raises:
-            Exception: Si la session n'existe pas ou erreur de persistance
         """
         try:
-            # Récupérer la session actuelle
-            session = await self.session_manager.get_session(self.session_id)
-            
-            if not session:
-                raise ValueError(f"Session {self.session_id} not found for tracing")
-            
             # Créer une nouvelle étape de trace
             trace_step = TraceStep(
-                timestamp=datetime.now(),
+                timestamp=time.time_ns(),
                 component=component,
                 event=event,
                 details=details or {}
             )
             
-            # Ajouter l'étape à la trace de la session
-            session.trace.append(trace_step)
-            
-            # Sauvegarder la session mise à jour
-            await self.session_manager.save_session(session)
+            # Persistance hors du chemin critique
+            self._enqueue(trace_step)
             
             # JALON 4.3: Collecte de métriques Prometheus en parallèle du traçage
             self._collect_metrics_from_trace_step(component, event, details or {})
             
             # Log pour le développement (avec masquage des données sensibles)
-            safe_details = self._sanitize_details_for_logging(details or {})
-            self.logger.debug(
-                f"Trace step recorded: {component}.{event} - {safe_details}"
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                safe_details = self._sanitize_details_for_logging(details or {})
+                self.logger.debug(
+                    "Trace step recorded: %s.%s - %s", component, event, safe_details
+                )
             
         except Exception as e:
             self.logger.error(
-                f"Failed to log trace step {component}.{event}: {str(e)}"
+                "Failed to log trace step %s.%s: %s", component, event, e
             )
             # Ne pas lever l'exception pour ne pas casser le flux principal
             # Le tracing est auxiliaire, pas critique
     
+    def _enqueue(self, trace_step: TraceStep) -> None:
+        """
+        Place une étape dans la file d'écriture et démarre l'écrivain si nécessaire
+        
+        Args:
+            trace_step: Étape à persister
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._drain())
+        self._queue.put_nowait(trace_step)
+    
+    async def _drain(self) -> None:
+        """
+        Écrivain d'arrière-plan : persiste les étapes par lots
+        
+        Regroupe jusqu'à TRACE_BATCH_SIZE étapes arrivées dans une fenêtre de
+        TRACE_BATCH_WINDOW_SECONDS et les ajoute à la session en cache. La session
+        n'est sauvegardée qu'au plus une fois par TRACE_SAVE_INTERVAL_SECONDS,
+        y compris lorsque plus aucune étape n'arrive. L'écrivain se termine dès
+        que la file est vide et que tout a été sauvegardé.
+        """
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._dirty:
+                # Sauvegarde périodique des étapes en attente
+                remaining = self._last_save + TRACE_SAVE_INTERVAL_SECONDS - loop.time()
+                try:
+                    first = await asyncio.wait_for(queue.get(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    await self._save()
+                    continue
+            elif queue.empty():
+                # Rien en file ni à sauvegarder : l'écrivain s'arrête (_enqueue le relance)
+                return
+            else:
+                first = queue.get_nowait()
+            
+            batch: List[TraceStep] = [first]
+            deadline = loop.time() + TRACE_BATCH_WINDOW_SECONDS
+            while len(batch) < TRACE_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._persist(batch)
+                if loop.time() - self._last_save >= TRACE_SAVE_INTERVAL_SECONDS:
+                    await self._save()
+            except Exception as e:
+                self.logger.error("Failed to persist %d trace steps: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _persist(self, batch: List[TraceStep]) -> None:
+        """
+        Ajoute un lot d'étapes à la trace de la session en cache
+        
+        La session n'est récupérée auprès du SessionManager qu'au premier lot.
+        
+        Args:
+            batch: Étapes à persister
+            
+        Raises:
+            ValueError: Si la session n'existe pas
+        """
+        if self._session_cache is None:
+            # Les sessions sont indexées par la forme str de leur UUID
+            session = await self.session_manager.get_session(str(self.session_id))
+            if not session:
+                raise ValueError(f"Session {self.session_id} not found for tracing")
+            self._session_cache = session
+        
+        self._session_cache.trace.extend(batch)
+        self._pending_steps.extend(batch)
+        self._dirty = True
+    
+    async def _save(self) -> None:
+        """
+        Persiste les étapes ajoutées depuis la dernière sauvegarde
+        
+        Seules les nouvelles étapes sont transmises au SessionManager, qui peut
+        ainsi les écrire en ajout plutôt que de re-sérialiser toute la trace.
+        Elles sont remises en attente si l'écriture échoue ou est annulée.
+        """
+        if not self._dirty:
+            return
+        steps, self._pending_steps = self._pending_steps, []
+        self._dirty = False
+        self._last_save = asyncio.get_running_loop().time()
+        saved = False
+        try:
+            await self.session_manager.append_trace_steps(self._session_cache, steps)
+            saved = True
+        except Exception as e:
+            self.logger.error("Failed to save trace for session %s: %s", self.session_id, e)
+        finally:
+            if not saved:
+                # Échec ou annulation : les étapes sont remises en attente
+                self._pending_steps[:0] = steps
+                self._dirty = True
+    
+    async def flush(self) -> None:
+        """
+        Attend le traitement des étapes en file, sauvegarde la session et arrête l'écrivain
+        """
+        if self._queue is not None:
+            await self._queue.join()
+        writer_task, self._writer_task = self._writer_task, None
+        if writer_task is not None:
+            writer_task.cancel()
+            # Attente de l'arrêt effectif : une sauvegarde interrompue a remis
+            # ses étapes en attente avant que _save ne soit rappelé ci-dessous
+            await asyncio.wait({writer_task})
+        await self._save()
+    
     async def log_router_start(self, request_summary: str) -> None:
         """Log le début du processus de routage"""
         await self.log_step(
@@ -125,16 +278,30 @@ class Tracer:
             details={"agent_name": agent_name, "iteration": iteration}
         )
     
-    async def log_llm_call(self, provider: str, model: str, prompt_length: int) -> None:
-        """Log un appel LLM"""
+    async def log_llm_call(
+        self, 
+        provider: str, 
+        model: str, 
+        prompt_length: Optional[int] = None,
+        prompt_length_provider: Optional[Callable[[], int]] = None
+    ) -> None:
+        """
+        Log un appel LLM
+        
+        La longueur du prompt peut être fournie directement ou via un callable
+        évalué uniquement si le tracer capture cette information.
+        """
+        details = {"provider": provider, "model": model}
+        if self.capture_prompt_length:
+            if prompt_length is None and prompt_length_provider is not None:
+                prompt_length = prompt_length_provider()
+            if prompt_length is not None:
+                details["prompt_length"] = prompt_length
+        
         await self.log_step(
             component="LLM",
             event="llm_call",
-            details={
-                "provider": provider,
-                "model": model,
-                "prompt_length": prompt_length
-            }
+            details=details
         )
     
     async def log_llm_response(self, provider: str, response_length: int, tools_called: int = 0) -> None:
@@ -211,122 +378,28 @@ class Tracer:
         """
         Collecte les métriques Prometheus à partir d'une étape de trace (JALON 4.3)
         
-        Cette méthode analyse les événements de trace et enregistre les métriques
-        correspondantes dans le collecteur Prometheus pour l'observabilité.
+        Les événements sont associés à leur métrique via la table _METRIC_DISPATCH
+        indexée par (composant, événement) ; les autres événements contenant
+        "error" sont comptabilisés comme erreurs de l'orchestrateur.
+        
+        L'enregistrement Prometheus est différé : l'étape est placée dans un
+        tampon vidé en arrière-plan toutes les METRICS_DRAIN_INTERVAL_SECONDS.
         
         Args:
             component: Composant source de l'événement
             event: Type d'événement
             details: Détails de l'événement
         """
-        try:
-            metrics_collector = get_metrics_collector()
-            
-            # ===================================================================
-            # MÉTRIQUES LLM
-            # ===================================================================
-            
-            if event == "llm_call" and component in ["AgentOrchestrator", "ResilientLLMService"]:
-                provider = details.get("provider", "unknown")
-                model = details.get("model", "unknown")
-                
-                # Estimer la durée si on a des informations de latence
-                if "prompt_length" in details:
-                    # Estimation basique : 1s pour 1000 caractères de prompt
-                    estimated_duration = details["prompt_length"] / 1000.0
-                    metrics_collector.record_llm_call(
-                        provider=provider,
-                        model=model,
-                        duration_seconds=estimated_duration,
-                        status="initiated"
-                    )
-            
-            elif event == "llm_call_success":
-                provider = details.get("provider", "unknown")
-                model = details.get("model", "unknown")
-                response_length = details.get("response_length", 0)
-                
-                # Estimation de durée basée sur la longueur de réponse
-                estimated_duration = max(0.5, response_length / 500.0)  # Min 0.5s
-                
-                metrics_collector.record_llm_call(
-                    provider=provider,
-                    model=model,
-                    duration_seconds=estimated_duration,
-                    status="success"
-                )
-            
-            # ===================================================================
-            # MÉTRIQUES ERREURS
-            # ===================================================================
-            
-            elif event in ["retry_attempt_failed", "max_retries_exceeded"] and component == "ResilientLLMService":
-                error_type = details.get("error_type", "unknown")
-                metrics_collector.record_orchestrator_error(
-                    error_type=error_type,
-                    component=component
-                )
-            
-            elif "error" in event.lower():
-                error_type = details.get("error_type", event)
-                metrics_collector.record_orchestrator_error(
-                    error_type=error_type,
-                    component=component
-                )
-            
-            # ===================================================================
-            # MÉTRIQUES RETRY
-            # ===================================================================
-            
-            elif event == "retry_attempt_start" and component == "ResilientLLMService":
-                provider = details.get("provider", "unknown")
-                attempt = details.get("attempt", 1)
-                
-                metrics_collector.record_retry_attempt(
-                    provider=provider,
-                    attempt_number=attempt,
-                    final_status="in_progress"
-                )
-            
-            # ===================================================================
-            # MÉTRIQUES OUTILS
-            # ===================================================================
-            
-            elif event == "tool_execution" and component == "AgentOrchestrator":
-                tool_name = details.get("tool_name", "unknown")
-                # Estimation de durée d'exécution d'outil
-                estimated_duration = 0.1  # 100ms par défaut
-                
-                metrics_collector.record_tool_execution(
-                    tool_name=tool_name,
-                    duration_seconds=estimated_duration,
-                    status="success"
-                )
-            
-            # ===================================================================
-            # MÉTRIQUES ORCHESTRATION
-            # ===================================================================
-            
-            elif event == "orchestration_start":
-                agent_name = details.get("agent_name", "unknown")
-                # La durée sera calculée lors du final_response
-                
-            elif event == "final_response":
-                agent_name = details.get("agent_name", "unknown") 
-                total_steps = details.get("total_steps", 1)
-                
-                # Estimation de durée basée sur le nombre d'étapes
-                estimated_duration = total_steps * 2.0  # 2s par étape
-                
-                metrics_collector.record_orchestration_duration(
-                    agent_name=agent_name,
-                    duration_seconds=estimated_duration,
-                    status="success"
-                )
-            
-        except Exception as e:
-            # Ne pas faire échouer le traçage si la collecte de métriques échoue
-            logger.warning(f"Failed to collect metrics from trace step: {str(e)}")
+        handler = _METRIC_DISPATCH.get((component, event))
+        if handler is None:
+            if "error" not in event.lower():
+                return
+            handler = _record_generic_error
+        
+        _metrics_buffer.append((handler, self._metrics_collector, component, details))
+        global _metrics_drain_task
+        if _metrics_drain_task is None or _metrics_drain_task.done():
+            _metrics_drain_task = asyncio.create_task(_drain_metrics())
     
     def _sanitize_details_for_logging(self, details: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -339,33 +412,126 @@ class Tracer:
             Dict avec données sensibles masquées
         """
         sanitized = {}
-        sensitive_keys = {'api_key', 'password', 'token', 'secret', 'credential'}
         
         for key, value in details.items():
-            if any(sensitive_key in key.lower() for sensitive_key in sensitive_keys):
+            if _SENSITIVE_RE.search(key):
                 sanitized[key] = "***MASKED***"
             elif isinstance(value, str) and len(value) > 100:
                 # Tronquer les chaînes très longues
-                sanitized[key] = value[:100] + "..."
+                sanitized[key] = value[:100] + "…"
             else:
                 sanitized[key] = value
                 
         return sanitized
 
 
+# ===================================================================
+# COLLECTE DE MÉTRIQUES PAR ÉVÉNEMENT DE TRACE (JALON 4.3)
+# ===================================================================
+
+def _record_llm_call(metrics_collector, component: str, details: Dict[str, Any]) -> None:
+    """Appel LLM initié (durée estimée d'après la taille du prompt)"""
+    if "prompt_length" in details:
+        # Estimation basique : 1s pour 1000 caractères de prompt
+        metrics_collector.record_llm_call(
+            provider=details.get("provider", "unknown"),
+            model=details.get("model", "unknown"),
+            duration_seconds=details["prompt_length"] / 1000.0,
+            status="initiated"
+        )
+
+
+def _record_llm_success(metrics_collector, component: str, details: Dict[str, Any]) -> None:
+    """Appel LLM réussi (durée estimée d'après la taille de la réponse)"""
+    metrics_collector.record_llm_call(
+        provider=details.get("provider", "unknown"),
+        model=details.get("model", "unknown"),
+        duration_seconds=max(0.5, details.get("response_length", 0) / 500.0),  # Min 0.5s
+        status="success"
+    )
+
+
+def _record_generic_error(metrics_collector, component: str, details: Dict[str, Any]) -> None:
+    """Erreur d'orchestration (échec de tentative, épuisement des retries, erreur tracée)"""
+    metrics_collector.record_orchestrator_error(
+        error_type=details.get("error_type", "unknown"),
+        component=component
+    )
+
+
+def _record_retry_attempt(metrics_collector, component: str, details: Dict[str, Any]) -> None:
+    """Nouvelle tentative d'appel LLM (la première tentative n'est pas un retry)"""
+    if details.get("attempt", 1) > 1:
+        metrics_collector.record_retry_attempt(component=component, operation="llm_call")
+
+
+def _record_tool_execution(metrics_collector, component: str, details: Dict[str, Any]) -> None:
+    """Exécution d'outil (100ms par défaut)"""
+    metrics_collector.record_tool_execution(
+        tool_name=details.get("tool_name", "unknown"),
+        duration_seconds=0.1,
+        status="success"
+    )
+
+
+# Table de dispatch (composant, événement) -> enregistrement de la métrique
+_METRIC_DISPATCH: Dict[Tuple[str, str], Callable[[Any, str, Dict[str, Any]], None]] = {
+    ("AgentOrchestrator", "llm_call"): _record_llm_call,
+    ("ResilientLLMService", "llm_call"): _record_llm_call,
+    ("ResilientLLMService", "llm_call_success"): _record_llm_success,
+    ("ResilientLLMService", "retry_attempt_failed"): _record_generic_error,
+    ("ResilientLLMService", "max_retries_exceeded"): _record_generic_error,
+    ("ResilientLLMService", "retry_attempt_start"): _record_retry_attempt,
+    ("AgentOrchestrator", "tool_execution"): _record_tool_execution,
+}
+
+
+# Tampon des métriques en attente : (handler, collecteur, composant, détails)
+# (les plus anciennes sont abandonnées si le tampon déborde)
+_metrics_buffer: "deque[Tuple[Callable[[Any, str, Dict[str, Any]], None], Any, str, Dict[str, Any]]]" = deque(
+    maxlen=METRICS_BUFFER_MAX_SIZE
+)
+_metrics_drain_task: Optional[asyncio.Task] = None
+
+
+async def _drain_metrics() -> None:
+    """
+    Enregistre les métriques en attente dans le collecteur Prometheus, par lots
+    
+    S'arrête lorsque le tampon est vide ; relancée par la prochaine étape tracée.
+    """
+    while True:
+        await asyncio.sleep(METRICS_DRAIN_INTERVAL_SECONDS)
+        if not _metrics_buffer:
+            return
+        
+        while _metrics_buffer:
+            handler, metrics_collector, component, details = _metrics_buffer.popleft()
+            try:
+                handler(metrics_collector, component, details)
+            except Exception as e:
+                # Ne pas faire échouer le traçage si la collecte de métriques échoue
+                logger.warning("Failed to collect metrics from trace step: %s", e)
+
+
 class TracerFactory:
     """Factory pour créer des instances de Tracer"""
     
     @staticmethod
-    def create_tracer(session_id: UUID, session_manager: SessionManager) -> Tracer:
+    def create_tracer(
+        session_id: UUID, 
+        session_manager: SessionManager,
+        capture_prompt_length: bool = True
+    ) -> Tracer:
         """
         Crée une nouvelle instance de Tracer
         
         Args:
             session_id: UUID de la session
             session_manager: Manager pour la persistance
+            capture_prompt_length: Mesurer la taille des prompts LLM
             
         Returns:
             Instance de Tracer configurée
         """
-        return Tracer(session_id, session_manager)
\ No newline at end of file
+        return Tracer(session_id, session_manager, capture_prompt_length)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Codec JSON partagé
+
+Utilise orjson lorsqu'il est installé (parsing et sérialisation nettement plus
+rapides) et se replie sur le module json de la bibliothèque standard sinon.
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel
+    orjson = None
+
+# Exception levée par loads pour un document invalide (orjson.JSONDecodeError
+# hérite de json.JSONDecodeError)
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Désérialise un document JSON
+
+    Args:
+        data: Document JSON (str ou bytes)
+
+    Returns:
+        Any: Objet Python correspondant
+
+    Raises:
+        JSONDecodeError: Si le document n'est pas un JSON valide
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_dict(data: Optional[Union[str, bytes, bytearray]]) -> Dict[str, Any]:
+    """
+    Désérialise un objet JSON, en tolérant une entrée vide ou invalide
+
+    Destiné aux arguments d'appels d'outils renvoyés par les LLM.
+
+    Args:
+        data: Document JSON (str ou bytes), éventuellement vide
+
+    Returns:
+        Dict[str, Any]: Objet décodé, ou {} si le document est vide, invalide
+        ou n'est pas un objet JSON
+    """
+    if not data:
+        return {}
+    try:
+        value = loads(data)
+    except JSONDecodeError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Sérialise un objet en JSON compact (bytes UTF-8)
+
+    Les objets non sérialisables sont convertis via repr().
+
+    Args:
+        obj: Objet à sérialiser
+        sort_keys: Trie les clés des dictionnaires (sortie canonique)
+
+    Returns:
+        bytes: Document JSON encodé en UTF-8
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        try:
+            return orjson.dumps(obj, option=option, default=repr)
+        except TypeError:
+            # Clés non str ou entiers hors bornes : repli sur json
+            pass
+    return json.dumps(
+        obj, sort_keys=sort_keys, default=repr, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Sérialise un objet en JSON compact (str)
+
+    Args:
+        obj: Objet à sérialiser
+        sort_keys: Trie les clés des dictionnaires (sortie canonique)
+
+    Returns:
+        str: Document JSON
+    """
+    return dumps_bytes(obj, sort_keys=sort_keys).decode("utf-8")
@@ -0,0 +1,126 @@
+"""
+Client HTTP partagé des adaptateurs LLM
+
+Un seul httpx.AsyncClient est partagé par les clients SDK (OpenAI, Anthropic et
+fournisseurs compatibles OpenAI) : les connexions TCP/TLS restent ouvertes et
+sont réutilisées d'une requête à l'autre et d'un fournisseur à l'autre. Les
+corps JSON des requêtes sont sérialisés par orjson lorsqu'il est installé.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : sérialisation httpx standard
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (HTTP/2 optionnel, fourni par httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Limites du pool de connexions partagé
+MAX_KEEPALIVE_CONNECTIONS = 64
+MAX_CONNECTIONS = 128
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+DEFAULT_TIMEOUT_SECONDS = 60.0
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Empreinte (clé API, URL) -> client AsyncOpenAI partagé entre instances d'adaptateurs
+_openai_clients: Dict[str, Any] = {}
+_openai_clients_lock = threading.Lock()
+
+
+class _OrjsonAsyncClient(httpx.AsyncClient):
+    """
+    AsyncClient dont les corps json= sont sérialisés par orjson
+
+    Les SDK (OpenAI, Anthropic) construisent leurs requêtes via build_request(json=...) :
+    le corps est encodé une seule fois, par orjson au lieu du module json.
+    """
+
+    def build_request(self, method, url, *, content=None, json=None, **kwargs) -> httpx.Request:
+        if json is not None and content is None:
+            try:
+                content = orjson.dumps(json)
+            except TypeError:
+                # Type non pris en charge par orjson : sérialisation httpx standard
+                pass
+            else:
+                request = super().build_request(method, url, content=content, **kwargs)
+                request.headers.setdefault("Content-Type", "application/json")
+                return request
+        return super().build_request(method, url, content=content, json=json, **kwargs)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retourne le client HTTP partagé (créé au premier appel)
+
+    Returns:
+        httpx.AsyncClient: Client partagé par tous les adaptateurs
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        client_class = _OrjsonAsyncClient if orjson is not None else httpx.AsyncClient
+        _http_client = client_class(
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=MAX_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+            http2=HTTP2_AVAILABLE
+        )
+    return _http_client
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None) -> Any:
+    """
+    Retourne le client AsyncOpenAI partagé pour une clé API et une URL de base
+
+    Les adaptateurs OpenAI et compatibles (DeepSeek, Grok, Kimi, Qwen) créés
+    avec la même clé réutilisent le même client, adossé au client HTTP partagé.
+
+    Args:
+        api_key: Clé API validée
+        base_url: URL de base de l'API (None pour l'API OpenAI)
+
+    Returns:
+        AsyncOpenAI: Client partagé
+    """
+    key = hashlib.sha256(f"{api_key}|{base_url}".encode("utf-8")).hexdigest()
+    client = _openai_clients.get(key)
+    if client is None:
+        with _openai_clients_lock:
+            client = _openai_clients.get(key)
+            if client is None:
+                from openai import AsyncOpenAI  # import différé du SDK
+                client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=get_http_client())
+                _openai_clients[key] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """
+    Ferme le client HTTP partagé (à appeler à l'arrêt de l'application)
+    """
+    global _http_client
+    # Les clients SDK mis en cache reposent sur le client HTTP fermé
+    _openai_clients.clear()
+    if _http_client is not None:
+        try:
+            await _http_client.aclose()
+        except Exception as e:
+            logger.warning("⚠️ Fermeture du client HTTP partagé impossible: %s", e)
+        _http_client = None
@@ -0,0 +1,48 @@
+"""
+Conversion des messages partagée par les adaptateurs LLM
+
+ChatMessage ne comporte que les champs role et content : son __dict__ est
+directement le dictionnaire attendu par les API (copié, le modèle étant figé).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.models.data_contracts import ChatMessage
+
+
+def message_dicts(messages: Iterable[ChatMessage]) -> List[Dict[str, str]]:
+    """
+    Convertit des messages au format {"role", "content"} des API de chat
+
+    Args:
+        messages: Messages à convertir
+
+    Returns:
+        List[Dict[str, str]]: Messages au format API
+    """
+    return [dict(msg.__dict__) for msg in messages]
+
+
+def split_system_message(
+    messages: Iterable[ChatMessage]
+) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """
+    Sépare le prompt système des autres messages en un seul parcours
+
+    Pour les API qui reçoivent le prompt système à part (Anthropic) ; en cas
+    de plusieurs messages système, le dernier l'emporte.
+
+    Args:
+        messages: Messages à convertir
+
+    Returns:
+        Tuple: (prompt système ou None, autres messages au format API)
+    """
+    system_message = None
+    converted = []
+    for msg in messages:
+        if msg.role == "system":
+            system_message = msg.content
+        else:
+            converted.append(dict(msg.__dict__))
+    return system_message, converted
@@ -0,0 +1,25 @@
+"""
+Streaming partagé par les adaptateurs compatibles OpenAI
+
+Le flux est ouvert dans un contexte async with : la réponse HTTP est fermée et
+la connexion rendue au pool même lorsque le consommateur s'arrête avant la fin.
+"""
+
+from typing import Any, AsyncIterator, Dict
+
+
+async def openai_text_stream(client: Any, params: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Transmet les fragments de texte d'un appel chat.completions en streaming
+
+    Args:
+        client: Client AsyncOpenAI (ou compatible) du fournisseur
+        params: Paramètres de l'appel (stream=True inclus)
+
+    Yields:
+        str: Fragments de texte, dans l'ordre de génération
+    """
+    async with await client.chat.completions.create(**params) as stream:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,60 @@
+"""
+Formatage des outils partagé par les adaptateurs LLM
+
+Les schémas d'outils ne dépendent que de la classe de l'outil : le résultat de
+format_tools_for_llm est mémoïsé par fournisseur et par jeu d'outils.
+"""
+
+import functools
+from typing import Any, Dict, List, Tuple
+
+from src.models.data_contracts import ToolDefinition
+
+# Nombre maximal de jeux d'outils mémorisés (le cache est vidé au-delà)
+FORMATTED_TOOLS_CACHE_SIZE = 128
+
+# (fournisseur, empreinte du jeu d'outils) -> outils au format du fournisseur
+_formatted_tools_cache: Dict[Tuple[str, Tuple], Tuple[Dict[str, Any], ...]] = {}
+
+
+def tool_set_key(tool_definitions: List[ToolDefinition]) -> Tuple:
+    """
+    Calcule l'empreinte stable d'un jeu d'outils
+
+    Args:
+        tool_definitions: Définitions d'outils
+
+    Returns:
+        Tuple: (classe, nom, description) de chaque outil, dans l'ordre
+    """
+    return tuple(
+        (type(tool).__qualname__, tool.name, tool.description)
+        for tool in tool_definitions
+    )
+
+
+def memoize_tool_format(func):
+    """
+    Décorateur de format_tools_for_llm : mémoïse le formatage par fournisseur et jeu d'outils
+
+    La liste retournée est une copie, mais les dictionnaires d'outils sont
+    partagés entre appels et ne doivent pas être modifiés.
+
+    Args:
+        func: Méthode format_tools_for_llm d'un adaptateur LLM
+
+    Returns:
+        Méthode enveloppée
+    """
+    @functools.wraps(func)
+    async def wrapper(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
+        key = (self.get_provider_name(), tool_set_key(tool_definitions))
+        formatted = _formatted_tools_cache.get(key)
+        if formatted is None:
+            formatted = tuple(await func(self, tool_definitions))
+            if len(_formatted_tools_cache) >= FORMATTED_TOOLS_CACHE_SIZE:
+                _formatted_tools_cache.clear()
+            _formatted_tools_cache[key] = formatted
+        return list(formatted)
+
+    return wrapper
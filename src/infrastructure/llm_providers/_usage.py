@@ -0,0 +1,37 @@
+"""
+Extraction de l'usage des réponses des API compatibles OpenAI
+
+Les fournisseurs compatibles OpenAI mettent en cache automatiquement le préfixe
+stable des requêtes (prompt système, début d'historique) : le nombre de tokens
+servis depuis ce cache est remonté dans l'usage pour l'observabilité.
+"""
+
+from typing import Any, Dict, Optional
+
+
+def openai_usage(usage: Any) -> Optional[Dict[str, Any]]:
+    """
+    Convertit l'objet usage d'une réponse chat.completions en dictionnaire
+
+    Args:
+        usage: Attribut usage de la réponse (peut être None)
+
+    Returns:
+        Optional[Dict[str, Any]]: Tokens du prompt, de la complétion, total et
+        tokens lus depuis le cache de préfixe (None si non communiqué)
+    """
+    if not usage:
+        return None
+
+    # OpenAI / xAI : prompt_tokens_details.cached_tokens ; Moonshot : cached_tokens
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    if cached_tokens is None:
+        cached_tokens = getattr(usage, "cached_tokens", None)
+
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+        "cached_tokens": cached_tokens
+    }
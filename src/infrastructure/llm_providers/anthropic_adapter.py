@@ -3,11 +3,14 @@
 import os
 import json
 import logging
-from typing import List, Optional, Dict, Any
-import anthropic
+from typing import AsyncIterator, List, Optional, Dict, Any
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._http import get_http_client
+from src.infrastructure.llm_providers._messages import split_system_message
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
-    ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
+    AgentConfig, ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
 )
 from src.infrastructure.secure_api_key_handler import (
@@ -17,6 +20,13 @@ from src.infrastructure.secure_api_key_handler import (
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Taille minimale d'un prompt système pour le marquer en cache (≈ 1024 tokens à ~4 car./token)
+PROMPT_CACHE_MIN_CHARS = 4096
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+# Nombre maximal de configurations d'agent dont les paramètres fixes sont conservés
+BASE_PARAMS_CACHE_SIZE = 64
+
 
 class AnthropicAdapter(LLMServiceInterface):
     """Adaptateur pour l'API Anthropic Claude avec validation et gestion sécurisée des clés"""
@@ -37,9 +47,11 @@ class AnthropicAdapter(LLMServiceInterface):
                 ProviderType.ANTHROPIC, api_key
             )
             
-            # Initialisation du client Anthropic
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            # Initialisation du client Anthropic asynchrone (n'occupe pas la boucle d'événements)
+            import anthropic  # import différé du SDK
+            self.client = anthropic.AsyncAnthropic(api_key=self.api_key, http_client=get_http_client())
             self.default_model = "claude-3-5-sonnet-20241022"
+            self._base_params_cache: Dict[tuple, Dict[str, Any]] = {}
             
             # Log sécurisé de l'initialisation
             config_info = SecureAPIKeyHandler.get_secure_config_info(
@@ -58,6 +70,7 @@ class AnthropicAdapter(LLMServiceInterface):
             self.api_key = None
             raise APIKeyError(f"Échec de l'initialisation du client Anthropic: {str(e)}")
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -70,66 +83,170 @@ class AnthropicAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Anthropic API key not configured")
 
-        # Conversion des messages vers le format Anthropic
-        anthropic_messages = []
-        system_message = None
-        
-        for msg in messages:
-            if msg.role == "system":
-                # Anthropic traite les messages système séparément
-                system_message = msg.content
-            else:
-                anthropic_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-
-        # Paramètres de base
-        params = {
-            "model": model_version,
-            "messages": anthropic_messages,
-            "max_tokens": max_tokens or 1024,  # Obligatoire pour Anthropic
-        }
-        
-        if temperature is not None:
-            params["temperature"] = temperature
-        if system_message:
-            params["system"] = system_message
+        params = self._build_chat_params(messages, model_version, max_tokens, temperature)
 
         # Ajout des outils si fournis
         if tools:
             formatted_tools = await self.format_tools_for_llm(tools)
             if formatted_tools:
-                params["tools"] = formatted_tools
+                params["tools"] = self._mark_tools_cacheable(formatted_tools)
 
         try:
-            response = self.client.messages.create(**params)
+            response = await self.client.messages.create(**params)
             
             # Extraction du contenu de la réponse
-            content = ""
-            if response.content and len(response.content) > 0:
-                # Anthropic retourne une liste de blocs de contenu
-                for block in response.content:
-                    if hasattr(block, 'text'):
-                        content += block.text
-                    elif hasattr(block, 'type') and block.type == 'text':
-                        content += getattr(block, 'text', str(block))
-                    else:
-                        content += str(block)
+            # Anthropic retourne une liste de blocs de contenu (assemblés en une seule fois)
+            from anthropic.types import TextBlock
+            parts = [
+                block.text if isinstance(block, TextBlock) else str(block)
+                for block in response.content or ()
+            ]
+            content = "".join(parts)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=content,
                 provider=self.get_provider_name(),
                 model=response.model if hasattr(response, 'model') else model_version,
                 usage={
                     "prompt_tokens": response.usage.input_tokens if hasattr(response, 'usage') else None,
                     "completion_tokens": response.usage.output_tokens if hasattr(response, 'usage') else None,
-                    "total_tokens": (response.usage.input_tokens + response.usage.output_tokens) if hasattr(response, 'usage') else None
+                    "total_tokens": (response.usage.input_tokens + response.usage.output_tokens) if hasattr(response, 'usage') else None,
+                    "cached_tokens": getattr(response.usage, 'cache_read_input_tokens', None)
                 } if hasattr(response, 'usage') else None
             )
         except Exception as e:
             raise Exception(f"Anthropic API error: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming : le texte est transmis dès sa production
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            
+        Yields:
+            str: Fragments de texte, dans l'ordre de génération
+        """
+        if not self.client:
+            raise Exception("Anthropic API key not configured")
+
+        params = self._build_chat_params(messages, model_version, max_tokens, temperature)
+        try:
+            async with self.client.messages.stream(**params) as stream:
+                async for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
+
+    def _build_chat_params(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float]
+    ) -> Dict[str, Any]:
+        """
+        Construit les paramètres d'un appel messages.create / messages.stream
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (1024 par défaut)
+            temperature: Température pour la génération (optionnel)
+            
+        Returns:
+            Dict: Paramètres de l'appel (sans les outils)
+        """
+        # Conversion des messages vers le format Anthropic (système traité séparément)
+        system_message, anthropic_messages = split_system_message(messages)
+
+        # Paramètres de base
+        params = {
+            "model": model_version,
+            "messages": anthropic_messages,
+            "max_tokens": max_tokens or 1024,  # Obligatoire pour Anthropic
+        }
+        
+        if temperature is not None:
+            params["temperature"] = temperature
+        if system_message:
+            params["system"] = self._format_system(system_message)
+        return params
+
+    async def _get_base_params(self, agent_config: AgentConfig) -> Dict[str, Any]:
+        """
+        Retourne les paramètres d'orchestration qui ne dépendent que de la configuration d'agent
+        
+        Construits une seule fois par configuration ; l'appelant copie le dictionnaire
+        avant d'y ajouter les champs propres à la requête.
+        
+        Args:
+            agent_config: Configuration de l'agent
+            
+        Returns:
+            Dict: Paramètres partagés (modèle, max_tokens, temperature, outils)
+        """
+        tools_enabled = bool(agent_config.tools_enabled and agent_config.available_tools)
+        key = (agent_config.model_version, agent_config.max_tokens, agent_config.temperature, tools_enabled)
+        base_params = self._base_params_cache.get(key)
+        if base_params is None:
+            base_params = {
+                "model": agent_config.model_version,
+                "max_tokens": agent_config.max_tokens,
+                "temperature": agent_config.temperature,
+            }
+            if tools_enabled:
+                # Pour cette démo, on utilise GetCurrentTimeTool
+                from src.models.data_contracts import GetCurrentTimeTool
+                formatted_tools = await self.format_tools_for_llm([GetCurrentTimeTool()])
+                if formatted_tools:
+                    base_params["tools"] = self._mark_tools_cacheable(formatted_tools)
+            if len(self._base_params_cache) >= BASE_PARAMS_CACHE_SIZE:
+                self._base_params_cache.clear()
+            self._base_params_cache[key] = base_params
+        return base_params
+
+    @staticmethod
+    def _format_system(system_message: str) -> Any:
+        """
+        Prépare le prompt système, marqué pour le cache de prompts Anthropic s'il est long
+        
+        Les prompts courts restent une simple chaîne : en dessous du minimum de
+        tokens d'Anthropic, le marquage n'aurait aucun effet.
+        
+        Args:
+            system_message: Prompt système
+            
+        Returns:
+            Chaîne ou liste de blocs texte avec cache_control
+        """
+        if len(system_message) < PROMPT_CACHE_MIN_CHARS:
+            return system_message
+        return [{"type": "text", "text": system_message, "cache_control": _EPHEMERAL_CACHE}]
+
+    @staticmethod
+    def _mark_tools_cacheable(formatted_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Marque le dernier outil pour le cache de prompts (le préfixe des schémas d'outils est mis en cache)
+        
+        Args:
+            formatted_tools: Outils au format Anthropic
+            
+        Returns:
+            Liste d'outils dont le dernier porte cache_control
+        """
+        return formatted_tools[:-1] + [{**formatted_tools[-1], "cache_control": _EPHEMERAL_CACHE}]
+
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format Anthropic
@@ -161,7 +278,7 @@ class AnthropicAdapter(LLMServiceInterface):
         for tool in tool_definitions:
             try:
                 # Récupérer le schéma de l'outil
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 
                 # Extraire les informations de la fonction
                 if "function" in tool_schema:
@@ -189,7 +306,7 @@ class AnthropicAdapter(LLMServiceInterface):
                     })
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         return formatted_tools
@@ -210,78 +327,50 @@ class AnthropicAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Anthropic API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
+        # Conversion de l'historique vers le format Anthropic en un seul parcours
+        # (système traité séparément), puis ajout du message utilisateur
+        system_message, anthropic_messages = split_system_message(request.conversation_history)
+        anthropic_messages.append({"role": "user", "content": request.message})
 
-        # Conversion des messages vers le format Anthropic
-        anthropic_messages = []
-        system_message = None
-        
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-            else:
-                anthropic_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-
-        # Paramètres de base
-        params = {
-            "model": request.agent_config.model_version,
-            "messages": anthropic_messages,
-            "max_tokens": request.agent_config.max_tokens,
-            "temperature": request.agent_config.temperature,
-        }
+        # Paramètres fixes de la configuration (modèle, limites, outils) complétés par la requête
+        params = (await self._get_base_params(request.agent_config)).copy()
+        params["messages"] = anthropic_messages
         
         if system_message:
-            params["system"] = system_message
-
-        # Ajout des outils si activés
-        if request.agent_config.tools_enabled and request.agent_config.available_tools:
-            # Pour cette démo, on utilise GetCurrentTimeTool
-            from src.models.data_contracts import GetCurrentTimeTool
-            tools = [GetCurrentTimeTool()]
-            formatted_tools = await self.format_tools_for_llm(tools)
-            if formatted_tools:
-                params["tools"] = formatted_tools
+            params["system"] = self._format_system(system_message)
 
         try:
-            response = self.client.messages.create(**params)
+            response = await self.client.messages.create(**params)
 
             # Extraction du contenu et des tool calls
-            content = ""
+            parts = []
             tool_calls = []
             requires_tool_execution = False
             
-            if response.content and len(response.content) > 0:
-                for block in response.content:
-                    if hasattr(block, 'text'):
-                        content += block.text
-                    elif hasattr(block, 'type'):
-                        if block.type == 'text':
-                            content += getattr(block, 'text', str(block))
-                        elif block.type == 'tool_use':
-                            # Anthropic utilise tool_use pour les appels d'outils
-                            requires_tool_execution = True
-                            tool_calls.append(ToolCall(
-                                id=getattr(block, 'id', 'unknown'),
-                                tool_name=getattr(block, 'name', 'unknown'),
-                                arguments=getattr(block, 'input', {})
-                            ))
-                    else:
-                        content += str(block)
+            # Blocs typés du SDK : un test isinstance par bloc, sans sondage d'attributs
+            from anthropic.types import TextBlock, ToolUseBlock
+            for block in response.content or ():
+                if isinstance(block, TextBlock):
+                    parts.append(block.text)
+                elif isinstance(block, ToolUseBlock):
+                    # Anthropic utilise tool_use pour les appels d'outils
+                    requires_tool_execution = True
+                    tool_calls.append(ToolCall(
+                        id=block.id,
+                        tool_name=block.name,
+                        arguments=block.input
+                    ))
 
-            return OrchestrationResponse(
-                content=content,
+            return OrchestrationResponse.model_construct(
+                content="".join(parts),
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
                 model=request.agent_config.model_version,
                 usage={
                     "prompt_tokens": response.usage.input_tokens if hasattr(response, 'usage') else None,
                     "completion_tokens": response.usage.output_tokens if hasattr(response, 'usage') else None,
-                    "total_tokens": (response.usage.input_tokens + response.usage.output_tokens) if hasattr(response, 'usage') else None
+                    "total_tokens": (response.usage.input_tokens + response.usage.output_tokens) if hasattr(response, 'usage') else None,
+                    "cached_tokens": getattr(response.usage, 'cache_read_input_tokens', None)
                 } if hasattr(response, 'usage') else None,
                 requires_tool_execution=requires_tool_execution
             )
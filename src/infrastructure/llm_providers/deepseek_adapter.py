@@ -3,10 +3,14 @@
 import os
 import logging
 from typing import List, Optional, Dict, Any
-from openai import AsyncOpenAI
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.infrastructure import json_codec
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._http import get_openai_client
+from src.infrastructure.llm_providers._messages import message_dicts
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
-    ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
+    AgentConfig, ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
 )
 from src.infrastructure.secure_api_key_handler import (
@@ -15,6 +19,9 @@ from src.infrastructure.secure_api_key_handler import (
 
 logger = logging.getLogger(__name__)
 
+# Nombre maximal de configurations d'agent dont les paramètres fixes sont conservés
+BASE_PARAMS_CACHE_SIZE = 64
+
 
 class DeepSeekAdapter(LLMServiceInterface):
     """Adaptateur pour l'API DeepSeek (compatible OpenAI) avec sécurisation des clés API"""
@@ -35,11 +42,10 @@ class DeepSeekAdapter(LLMServiceInterface):
             self.secure_handler = SecureAPIKeyHandler()
             self.api_key = self.secure_handler.validate_api_key(raw_key, ProviderType.DEEPSEEK)
             
-            self.client = AsyncOpenAI(
-                api_key=self.api_key,
-                base_url="https://api.deepseek.com/v1"
-            )
+            # Client partagé entre instances (même clé et même URL : même pool de connexions)
+            self.client = get_openai_client(self.api_key, "https://api.deepseek.com/v1")
             self.default_model = "deepseek-chat"
+            self._base_params_cache: Dict[tuple, Dict[str, Any]] = {}
             
             logger.info(f"DeepSeek adapter initialized with key: {self.secure_handler.mask_api_key(self.api_key)}")
             
@@ -47,6 +53,7 @@ class DeepSeekAdapter(LLMServiceInterface):
             logger.error(f"Failed to initialize DeepSeek adapter: {e}")
             raise
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -61,10 +68,7 @@ class DeepSeekAdapter(LLMServiceInterface):
             raise APIKeyError("DeepSeek API key not configured")
 
         # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        openai_messages = message_dicts(messages)
 
         # Paramètres de la requête
         params = {
@@ -87,7 +91,7 @@ class DeepSeekAdapter(LLMServiceInterface):
         try:
             response = await self.client.chat.completions.create(**params)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=response.choices[0].message.content,
                 provider=self.get_provider_name(),
                 model=response.model,
@@ -100,6 +104,7 @@ class DeepSeekAdapter(LLMServiceInterface):
         except Exception as e:
             raise Exception(f"DeepSeek API error: {str(e)}")
 
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format OpenAI (DeepSeek compatible)
@@ -114,11 +119,11 @@ class DeepSeekAdapter(LLMServiceInterface):
         
         for tool in tool_definitions:
             try:
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 formatted_tools.append(tool_schema)
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         return formatted_tools
@@ -139,33 +144,13 @@ class DeepSeekAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("DeepSeek API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Conversion de l'historique vers le format OpenAI, puis ajout du message utilisateur
+        openai_messages = message_dicts(request.conversation_history)
+        openai_messages.append({"role": "user", "content": request.message})
 
-        # Paramètres de base
-        params = {
-            "model": request.agent_config.model_version,
-            "messages": openai_messages,
-            "max_tokens": request.agent_config.max_tokens,
-            "temperature": request.agent_config.temperature,
-        }
-
-        # Ajout des outils si activés
-        if request.agent_config.tools_enabled and request.agent_config.available_tools:
-            # Pour cette démo, on utilise GetCurrentTimeTool
-            from src.models.data_contracts import GetCurrentTimeTool
-            tools = [GetCurrentTimeTool()]
-            formatted_tools = await self.format_tools_for_llm(tools)
-            if formatted_tools:
-                params["tools"] = formatted_tools
-                params["tool_choice"] = "auto"
+        # Paramètres fixes de la configuration (modèle, limites, outils) complétés par la requête
+        params = (await self._get_base_params(request.agent_config)).copy()
+        params["messages"] = openai_messages
 
         try:
             response = await self.client.chat.completions.create(**params)
@@ -181,10 +166,10 @@ class DeepSeekAdapter(LLMServiceInterface):
                     tool_calls.append(ToolCall(
                         id=tool_call.id,
                         tool_name=tool_call.function.name,
-                        arguments=eval(tool_call.function.arguments) if tool_call.function.arguments else {}
+                        arguments=json_codec.loads_dict(tool_call.function.arguments)
                     ))
 
-            return OrchestrationResponse(
+            return OrchestrationResponse.model_construct(
                 content=message.content,
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
@@ -199,6 +184,40 @@ class DeepSeekAdapter(LLMServiceInterface):
         except Exception as e:
             raise Exception(f"DeepSeek API error: {str(e)}")
 
+    async def _get_base_params(self, agent_config: AgentConfig) -> Dict[str, Any]:
+        """
+        Retourne les paramètres d'orchestration qui ne dépendent que de la configuration d'agent
+        
+        Construits une seule fois par configuration ; l'appelant copie le dictionnaire
+        avant d'y ajouter les champs propres à la requête.
+        
+        Args:
+            agent_config: Configuration de l'agent
+            
+        Returns:
+            Dict: Paramètres partagés (modèle, max_tokens, temperature, outils)
+        """
+        tools_enabled = bool(agent_config.tools_enabled and agent_config.available_tools)
+        key = (agent_config.model_version, agent_config.max_tokens, agent_config.temperature, tools_enabled)
+        base_params = self._base_params_cache.get(key)
+        if base_params is None:
+            base_params = {
+                "model": agent_config.model_version,
+                "max_tokens": agent_config.max_tokens,
+                "temperature": agent_config.temperature,
+            }
+            if tools_enabled:
+                # Pour cette démo, on utilise GetCurrentTimeTool
+                from src.models.data_contracts import GetCurrentTimeTool
+                formatted_tools = await self.format_tools_for_llm([GetCurrentTimeTool()])
+                if formatted_tools:
+                    base_params["tools"] = formatted_tools
+                    base_params["tool_choice"] = "auto"
+            if len(self._base_params_cache) >= BASE_PARAMS_CACHE_SIZE:
+                self._base_params_cache.clear()
+            self._base_params_cache[key] = base_params
+        return base_params
+
     async def simple_completion(self, prompt: str, **kwargs) -> str:
         """Génère une réponse simple à partir d'un prompt"""
         messages = [ChatMessage(role="user", content=prompt)]
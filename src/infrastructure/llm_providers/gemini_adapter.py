@@ -2,10 +2,10 @@
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from google import genai
-from google.genai import types
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
     ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
@@ -38,6 +38,7 @@ class GeminiAdapter(LLMServiceInterface):
             )
             
             # Initialisation du client Gemini
+            from google import genai  # import différé du SDK
             self.client = genai.Client(api_key=self.api_key)
             self.default_model = "gemini-1.5-pro"
             
@@ -58,6 +59,7 @@ class GeminiAdapter(LLMServiceInterface):
             self.api_key = None
             raise APIKeyError(f"Échec de l'initialisation du client Gemini: {str(e)}")
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -70,23 +72,9 @@ class GeminiAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Gemini API key not configured")
 
-        # Conversion des messages vers le format Gemini
-        # Gemini utilise un format de "contents" différent
-        gemini_contents = []
-        for msg in messages:
-            if msg.role == "user":
-                gemini_contents.append(msg.content)
-            elif msg.role == "assistant":
-                # Pour les réponses précédentes, on pourrait les inclure dans l'historique
-                # Pour simplifier, on prend juste le dernier message utilisateur
-                continue
-            elif msg.role == "system":
-                # Gemini traite les messages système différemment
-                # On pourrait les préfixer au premier message utilisateur
-                continue
-
-        # Si plusieurs messages, on prend le dernier utilisateur (simplification)
-        content = gemini_contents[-1] if gemini_contents else messages[-1].content
+        # Conversion des messages vers le format Gemini (historique complet,
+        # prompt système transmis via system_instruction)
+        system_instruction, content = self._build_contents(messages)
 
         # Configuration de la génération
         config_params = {}
@@ -94,7 +82,10 @@ class GeminiAdapter(LLMServiceInterface):
             config_params["max_output_tokens"] = max_tokens
         if temperature is not None:
             config_params["temperature"] = temperature
+        if system_instruction:
+            config_params["system_instruction"] = system_instruction
 
+        from google.genai import types
         config = types.GenerateContentConfig(**config_params) if config_params else None
 
         # Ajout des outils si fournis
@@ -120,7 +111,7 @@ class GeminiAdapter(LLMServiceInterface):
                     config=config
                 )
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=response.text if hasattr(response, 'text') else str(response),
                 provider=self.get_provider_name(),
                 model=model_version,
@@ -129,6 +120,34 @@ class GeminiAdapter(LLMServiceInterface):
         except Exception as e:
             raise Exception(f"Gemini API error: {str(e)}")
 
+    @staticmethod
+    def _build_contents(messages: Iterable[ChatMessage]) -> Tuple[Optional[str], List[Any]]:
+        """
+        Convertit les messages au format contents de Gemini
+        
+        Les messages système sont regroupés en une instruction système ; les
+        réponses de l'assistant prennent le rôle "model" attendu par Gemini.
+        
+        Args:
+            messages: Messages de la conversation
+            
+        Returns:
+            Tuple: (instruction système ou None, liste de types.Content)
+        """
+        from google.genai import types
+        system_parts = []
+        contents = []
+        for msg in messages:
+            if msg.role == "system":
+                system_parts.append(msg.content)
+            else:
+                contents.append(types.Content(
+                    role="user" if msg.role == "user" else "model",
+                    parts=[types.Part(text=msg.content)]
+                ))
+        return "\n\n".join(system_parts) or None, contents
+
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format Gemini
@@ -161,7 +180,7 @@ class GeminiAdapter(LLMServiceInterface):
         for tool in tool_definitions:
             try:
                 # Récupérer le schéma de l'outil
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 
                 # Extraire les informations de la fonction
                 if "function" in tool_schema:
@@ -183,7 +202,7 @@ class GeminiAdapter(LLMServiceInterface):
                     })
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         # Format final Gemini avec function_declarations
@@ -207,18 +226,18 @@ class GeminiAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Gemini API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Pour Gemini, on simplifie en prenant le dernier message
-        content = request.message
+        # Conversion de l'historique vers le format Gemini, puis ajout du message utilisateur
+        from google.genai import types
+        system_instruction, content = self._build_contents(request.conversation_history)
+        content.append(types.Content(role="user", parts=[types.Part(text=request.message)]))
 
         # Configuration de base
         config_params = {
             "max_output_tokens": request.agent_config.max_tokens,
             "temperature": request.agent_config.temperature,
         }
+        if system_instruction:
+            config_params["system_instruction"] = system_instruction
         config = types.GenerateContentConfig(**config_params)
 
         # Ajout des outils si activés
@@ -252,7 +271,7 @@ class GeminiAdapter(LLMServiceInterface):
             tool_calls = []
             requires_tool_execution = False
 
-            return OrchestrationResponse(
+            return OrchestrationResponse.model_construct(
                 content=response.text if hasattr(response, 'text') else str(response),
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
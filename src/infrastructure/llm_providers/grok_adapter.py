@@ -2,9 +2,13 @@
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from openai import AsyncOpenAI
+from typing import AsyncIterator, List, Optional, Dict, Any
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._http import get_openai_client
+from src.infrastructure.llm_providers._messages import message_dicts
+from src.infrastructure.llm_providers._streaming import openai_text_stream
+from src.infrastructure.llm_providers._usage import openai_usage
 from src.models.data_contracts import (
     ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
@@ -35,11 +39,10 @@ class GrokAdapter(LLMServiceInterface):
             self.secure_handler = SecureAPIKeyHandler()
             self.api_key = self.secure_handler.validate_api_key(raw_key, ProviderType.GROK)
             
-            self.client = AsyncOpenAI(
-                api_key=self.api_key,
-                base_url="https://api.x.ai/v1"
-            )
+            # Client partagé entre instances (même clé et même URL : même pool de connexions)
+            self.client = get_openai_client(self.api_key, "https://api.x.ai/v1")
             self.default_model = "grok-3-latest"
+            self._warned_no_tools = False
             
             logger.info(f"Grok adapter initialized with key: {self.secure_handler.mask_api_key(self.api_key)}")
             
@@ -47,6 +50,7 @@ class GrokAdapter(LLMServiceInterface):
             logger.error(f"Failed to initialize Grok adapter: {e}")
             raise
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -61,10 +65,7 @@ class GrokAdapter(LLMServiceInterface):
             raise APIKeyError("Grok API key not configured")
 
         # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        openai_messages = message_dicts(messages)
 
         # Paramètres de la requête
         params = {
@@ -77,57 +78,81 @@ class GrokAdapter(LLMServiceInterface):
         if temperature is not None:
             params["temperature"] = temperature
             
-        # Note: Selon la doc, Grok ne supporte pas le Function Calling
-        # Mais on garde l'interface cohérente pour l'extensibilité future
+        # Note: Selon la doc, Grok ne supporte pas le Function Calling :
+        # les outils sont ignorés sans être formatés
         if tools:
-            formatted_tools = await self.format_tools_for_llm(tools)
-            if formatted_tools:
-                # Grok ne supporte pas les tools selon la doc
-                # On pourrait les ignorer ou lever un warning
-                print("Warning: Grok ne supporte pas le Function Calling selon la documentation")
+            self._warn_tools_unsupported()
 
         try:
             response = await self.client.chat.completions.create(**params)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=response.choices[0].message.content,
                 provider=self.get_provider_name(),
                 model=response.model,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else None
+                usage=openai_usage(response.usage)
             )
         except Exception as e:
             raise Exception(f"Grok API error: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming : le texte est transmis dès sa production
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            
+        Yields:
+            str: Fragments de texte, dans l'ordre de génération
+        """
+        if not self.client:
+            raise APIKeyError("Grok API key not configured")
+
+        params = {
+            "model": model_version,
+            "messages": message_dicts(messages),
+            "stream": True,
+        }
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        if temperature is not None:
+            params["temperature"] = temperature
+
+        try:
+            async for text in openai_text_stream(self.client, params):
+                yield text
+        except Exception as e:
+            raise Exception(f"Grok API error: {str(e)}")
+
+    def _warn_tools_unsupported(self) -> None:
+        """Signale une seule fois par instance que les outils sont ignorés par Grok"""
+        if not self._warned_no_tools:
+            self._warned_no_tools = True
+            logger.warning("⚠️ Grok ne supporte pas le Function Calling - les outils seront ignorés")
+
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
-        Convertit nos ToolDefinition internes vers le format OpenAI (pour compatibilité future)
+        Convertit nos ToolDefinition internes vers le format Grok
         
-        Note: Grok ne supporte pas le Function Calling selon la documentation actuelle,
-        mais on maintient l'interface pour la cohérence et l'extensibilité future.
+        Note: Grok ne supporte pas le Function Calling selon la documentation actuelle :
+        aucun outil n'est transmis, la méthode est conservée pour la cohérence de l'interface.
         
         Args:
             tool_definitions: Liste des définitions d'outils internes
             
         Returns:
-            Liste des outils au format OpenAI (non utilisée par Grok actuellement)
+            Liste vide (outils non supportés par Grok)
         """
-        formatted_tools = []
-        
-        for tool in tool_definitions:
-            try:
-                # Format OpenAI standard (même si non supporté par Grok actuellement)
-                tool_schema = tool.get_tool_schema()
-                formatted_tools.append(tool_schema)
-            except Exception as e:
-                # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
-                continue
-                
-        return formatted_tools
+        return []
 
     async def orchestration_completion(
         self,
@@ -145,15 +170,9 @@ class GrokAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Grok API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Conversion de l'historique vers le format OpenAI, puis ajout du message utilisateur
+        openai_messages = message_dicts(request.conversation_history)
+        openai_messages.append({"role": "user", "content": request.message})
 
         # Paramètres de base
         params = {
@@ -165,7 +184,7 @@ class GrokAdapter(LLMServiceInterface):
 
         # Note: Grok ne supporte pas les outils selon la documentation
         if request.agent_config.tools_enabled and request.agent_config.available_tools:
-            print("Warning: Grok ne supporte pas le Function Calling - les outils seront ignorés")
+            self._warn_tools_unsupported()
 
         try:
             response = await self.client.chat.completions.create(**params)
@@ -175,16 +194,12 @@ class GrokAdapter(LLMServiceInterface):
             tool_calls = []
             requires_tool_execution = False
 
-            return OrchestrationResponse(
+            return OrchestrationResponse.model_construct(
                 content=message.content,
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
                 model=response.model,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else None,
+                usage=openai_usage(response.usage),
                 requires_tool_execution=requires_tool_execution
             )
         except Exception as e:
@@ -2,9 +2,15 @@
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from openai import AsyncOpenAI
+from typing import AsyncIterator, List, Optional, Dict, Any
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.infrastructure import json_codec
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._http import get_openai_client
+from src.infrastructure.llm_providers._messages import message_dicts
+from src.infrastructure.llm_providers._streaming import openai_text_stream
+from src.infrastructure.llm_providers._usage import openai_usage
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
     ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
@@ -35,10 +41,8 @@ class KimiK2Adapter(LLMServiceInterface):
             self.secure_handler = SecureAPIKeyHandler()
             self.api_key = self.secure_handler.validate_api_key(raw_key, ProviderType.KIMI_K2)
             
-            self.client = AsyncOpenAI(
-                api_key=self.api_key,
-                base_url="https://api.moonshot.cn/v1"
-            )
+            # Client partagé entre instances (même clé et même URL : même pool de connexions)
+            self.client = get_openai_client(self.api_key, "https://api.moonshot.cn/v1")
             self.default_model = "moonshot-v1-128k"
             
             logger.info(f"Kimi K2 adapter initialized with key: {self.secure_handler.mask_api_key(self.api_key)}")
@@ -47,6 +51,7 @@ class KimiK2Adapter(LLMServiceInterface):
             logger.error(f"Failed to initialize Kimi K2 adapter: {e}")
             raise
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -61,10 +66,7 @@ class KimiK2Adapter(LLMServiceInterface):
             raise APIKeyError("Kimi K2 API key not configured")
 
         # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        openai_messages = message_dicts(messages)
 
         # Paramètres de la requête
         params = {
@@ -87,19 +89,54 @@ class KimiK2Adapter(LLMServiceInterface):
         try:
             response = await self.client.chat.completions.create(**params)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=response.choices[0].message.content,
                 provider=self.get_provider_name(),
                 model=response.model,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else None
+                usage=openai_usage(response.usage)
             )
         except Exception as e:
             raise Exception(f"Kimi K2 API error: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming : le texte est transmis dès sa production
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            
+        Yields:
+            str: Fragments de texte, dans l'ordre de génération
+        """
+        if not self.client:
+            raise APIKeyError("Kimi K2 API key not configured")
+
+        params = {
+            "model": model_version,
+            "messages": message_dicts(messages),
+            "stream": True,
+        }
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        if temperature is not None:
+            params["temperature"] = temperature
+
+        try:
+            async for text in openai_text_stream(self.client, params):
+                yield text
+        except Exception as e:
+            raise Exception(f"Kimi K2 API error: {str(e)}")
+
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format OpenAI (Kimi K2 compatible)
@@ -114,11 +151,11 @@ class KimiK2Adapter(LLMServiceInterface):
         
         for tool in tool_definitions:
             try:
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 formatted_tools.append(tool_schema)
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         return formatted_tools
@@ -139,15 +176,9 @@ class KimiK2Adapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Kimi K2 API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Conversion de l'historique vers le format OpenAI, puis ajout du message utilisateur
+        openai_messages = message_dicts(request.conversation_history)
+        openai_messages.append({"role": "user", "content": request.message})
 
         # Paramètres de base
         params = {
@@ -181,19 +212,15 @@ class KimiK2Adapter(LLMServiceInterface):
                     tool_calls.append(ToolCall(
                         id=tool_call.id,
                         tool_name=tool_call.function.name,
-                        arguments=eval(tool_call.function.arguments) if tool_call.function.arguments else {}
+                        arguments=json_codec.loads_dict(tool_call.function.arguments)
                     ))
 
-            return OrchestrationResponse(
+            return OrchestrationResponse.model_construct(
                 content=message.content,
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
                 model=response.model,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                } if response.usage else None,
+                usage=openai_usage(response.usage),
                 requires_tool_execution=requires_tool_execution
             )
         except Exception as e:
@@ -1,10 +1,13 @@
 """Adaptateur Mistral - Implémentation de l'interface LLM pour Mistral avec Function Calling"""
 
+import asyncio
 import os
 import logging
 from typing import List, Optional, Dict, Any
-from mistralai.client import MistralClient
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._messages import message_dicts
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
     ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
@@ -35,6 +38,7 @@ class MistralAdapter(LLMServiceInterface):
             self.secure_handler = SecureAPIKeyHandler()
             self.api_key = self.secure_handler.validate_api_key(raw_key, ProviderType.MISTRAL)
             
+            from mistralai.client import MistralClient  # import différé du SDK
             self.client = MistralClient(api_key=self.api_key)
             self.default_model = "mistral-large-latest"
             
@@ -44,6 +48,7 @@ class MistralAdapter(LLMServiceInterface):
             logger.error(f"Failed to initialize Mistral adapter: {e}")
             raise
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -58,10 +63,7 @@ class MistralAdapter(LLMServiceInterface):
             raise APIKeyError("Mistral API key not configured")
 
         # Conversion des messages vers le format Mistral
-        mistral_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        mistral_messages = message_dicts(messages)
 
         # Paramètres de base
         params = {
@@ -81,7 +83,8 @@ class MistralAdapter(LLMServiceInterface):
                 params["tools"] = formatted_tools
 
         try:
-            response = self.client.chat(**params)
+            # Client SDK synchrone : appel dans un thread pour ne pas bloquer la boucle d'événements
+            response = await asyncio.to_thread(self.client.chat, **params)
             
             # Extraction du contenu de la réponse
             content = ""
@@ -94,7 +97,7 @@ class MistralAdapter(LLMServiceInterface):
             else:
                 content = str(response)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=content,
                 provider=self.get_provider_name(),
                 model=response.model if hasattr(response, 'model') else model_version,
@@ -107,6 +110,7 @@ class MistralAdapter(LLMServiceInterface):
         except Exception as e:
             raise Exception(f"Mistral API error: {str(e)}")
 
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format Mistral
@@ -137,11 +141,11 @@ class MistralAdapter(LLMServiceInterface):
         for tool in tool_definitions:
             try:
                 # Récupérer le schéma de l'outil (déjà au format OpenAI)
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 formatted_tools.append(tool_schema)
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         return formatted_tools
@@ -162,15 +166,9 @@ class MistralAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Mistral API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Conversion des messages vers le format Mistral
-        mistral_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Conversion de l'historique vers le format Mistral, puis ajout du message utilisateur
+        mistral_messages = message_dicts(request.conversation_history)
+        mistral_messages.append({"role": "user", "content": request.message})
 
         # Paramètres de base
         params = {
@@ -190,7 +188,8 @@ class MistralAdapter(LLMServiceInterface):
                 params["tools"] = formatted_tools
 
         try:
-            response = self.client.chat(**params)
+            # Client SDK synchrone : appel dans un thread pour ne pas bloquer la boucle d'événements
+            response = await asyncio.to_thread(self.client.chat, **params)
 
             # Extraction du contenu et des tool calls
             content = ""
@@ -214,7 +213,7 @@ class MistralAdapter(LLMServiceInterface):
                                 arguments=getattr(tool_call, 'function', {}).get('arguments', {})
                             ))
 
-            return OrchestrationResponse(
+            return OrchestrationResponse.model_construct(
                 content=content,
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
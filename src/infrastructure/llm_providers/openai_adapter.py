@@ -2,9 +2,14 @@
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from openai import AsyncOpenAI
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.infrastructure import json_codec
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._http import get_openai_client
+from src.infrastructure.llm_providers._messages import message_dicts
+from src.infrastructure.llm_providers._streaming import openai_text_stream
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
     ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
@@ -16,6 +21,14 @@ from src.infrastructure.secure_api_key_handler import (
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Modèles OpenAI disponibles (tuple partagé, non reconstruit à chaque appel)
+OPENAI_MODELS: Tuple[str, ...] = (
+    "gpt-4",
+    "gpt-4-turbo",
+    "gpt-3.5-turbo",
+    "gpt-3.5-turbo-16k",
+)
+
 
 class OpenAIAdapter(LLMServiceInterface):
     """Adaptateur pour l'API OpenAI avec validation et gestion sécurisée des clés"""
@@ -37,7 +50,8 @@ class OpenAIAdapter(LLMServiceInterface):
             )
             
             # Initialisation du client OpenAI
-            self.client = AsyncOpenAI(api_key=self.api_key)
+            # Client partagé entre instances (même clé et même URL : même pool de connexions)
+            self.client = get_openai_client(self.api_key)
             self.default_model = "gpt-3.5-turbo"
             
             # Log sécurisé de l'initialisation
@@ -57,6 +71,7 @@ class OpenAIAdapter(LLMServiceInterface):
             self.api_key = None
             raise APIKeyError(f"Échec de l'initialisation du client OpenAI: {str(e)}")
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -70,10 +85,7 @@ class OpenAIAdapter(LLMServiceInterface):
             raise APIKeyError("OpenAI client non initialisé. Vérifiez la configuration de votre clé API.")
 
         # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        openai_messages = message_dicts(messages)
 
         # Paramètres de la requête
         params = {
@@ -96,7 +108,7 @@ class OpenAIAdapter(LLMServiceInterface):
         try:
             response = await self.client.chat.completions.create(**params)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=response.choices[0].message.content,
                 provider=self.get_provider_name(),
                 model=response.model,
@@ -109,6 +121,45 @@ class OpenAIAdapter(LLMServiceInterface):
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming : le texte est transmis dès sa production
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            
+        Yields:
+            str: Fragments de texte, dans l'ordre de génération
+        """
+        if not self.client:
+            raise APIKeyError("OpenAI client non initialisé. Vérifiez la configuration de votre clé API.")
+
+        params = {
+            "model": model_version,
+            "messages": message_dicts(messages),
+            "stream": True,
+        }
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        if temperature is not None:
+            params["temperature"] = temperature
+
+        try:
+            async for text in openai_text_stream(self.client, params):
+                yield text
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format OpenAI
@@ -123,11 +174,11 @@ class OpenAIAdapter(LLMServiceInterface):
         
         for tool in tool_definitions:
             try:
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 formatted_tools.append(tool_schema)
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         return formatted_tools
@@ -148,15 +199,9 @@ class OpenAIAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("OpenAI API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Conversion de l'historique vers le format OpenAI, puis ajout du message utilisateur
+        openai_messages = message_dicts(request.conversation_history)
+        openai_messages.append({"role": "user", "content": request.message})
 
         # Paramètres de base
         params = {
@@ -180,20 +225,19 @@ class OpenAIAdapter(LLMServiceInterface):
             response = await self.client.chat.completions.create(**params)
             message = response.choices[0].message
 
-            # Vérifier si l'IA veut appeler des outils
-            tool_calls = []
-            requires_tool_execution = False
-            
-            if hasattr(message, 'tool_calls') and message.tool_calls:
-                requires_tool_execution = True
-                for tool_call in message.tool_calls:
-                    tool_calls.append(ToolCall(
-                        id=tool_call.id,
-                        tool_name=tool_call.function.name,
-                        arguments=eval(tool_call.function.arguments) if tool_call.function.arguments else {}
-                    ))
-
-            return OrchestrationResponse(
+            # Vérifier si l'IA veut appeler des outils (un seul accès à l'attribut)
+            message_tool_calls = getattr(message, 'tool_calls', None)
+            requires_tool_execution = bool(message_tool_calls)
+            tool_calls = [
+                ToolCall(
+                    id=tool_call.id,
+                    tool_name=tool_call.function.name,
+                    arguments=json_codec.loads_dict(tool_call.function.arguments)
+                )
+                for tool_call in message_tool_calls
+            ] if message_tool_calls else []
+
+            return OrchestrationResponse.model_construct(
                 content=message.content,
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
@@ -218,14 +262,9 @@ class OpenAIAdapter(LLMServiceInterface):
         """Retourne le nom du fournisseur"""
         return "openai"
 
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Sequence[str]:
         """Retourne la liste des modèles OpenAI disponibles"""
-        return [
-            "gpt-4",
-            "gpt-4-turbo",
-            "gpt-3.5-turbo",
-            "gpt-3.5-turbo-16k"
-        ]
+        return OPENAI_MODELS
 
     def is_healthy(self) -> bool:
         """Vérifie si le service OpenAI est disponible"""
@@ -2,9 +2,14 @@
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from openai import AsyncOpenAI
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
 from src.domain.llm_service_interface import LLMServiceInterface
+from src.infrastructure import json_codec
+from src.domain.llm_cache import cached_chat_completion
+from src.infrastructure.llm_providers._http import get_openai_client
+from src.infrastructure.llm_providers._messages import message_dicts
+from src.infrastructure.llm_providers._streaming import openai_text_stream
+from src.infrastructure.llm_providers._tools import memoize_tool_format
 from src.models.data_contracts import (
     ChatMessage, ChatResponse, ToolDefinition, ToolCall, 
     OrchestrationRequest, OrchestrationResponse
@@ -15,6 +20,14 @@ from src.infrastructure.secure_api_key_handler import (
 
 logger = logging.getLogger(__name__)
 
+# Modèles Qwen disponibles (tuple partagé, non reconstruit à chaque appel)
+QWEN_MODELS: Tuple[str, ...] = (
+    "qwen-max",
+    "qwen-vl-max",
+    "qwen-plus",
+    "qwen-turbo",
+)
+
 
 class QwenAdapter(LLMServiceInterface):
     """Adaptateur pour l'API Qwen via DashScope (compatible OpenAI) avec sécurisation des clés API"""
@@ -35,10 +48,8 @@ class QwenAdapter(LLMServiceInterface):
             self.secure_handler = SecureAPIKeyHandler()
             self.api_key = self.secure_handler.validate_api_key(raw_key, ProviderType.QWEN)
             
-            self.client = AsyncOpenAI(
-                api_key=self.api_key,
-                base_url="https://dashscope.aliyuncs.com/v1"
-            )
+            # Client partagé entre instances (même clé et même URL : même pool de connexions)
+            self.client = get_openai_client(self.api_key, "https://dashscope.aliyuncs.com/v1")
             self.default_model = "qwen-max"
             
             logger.info(f"Qwen adapter initialized with key: {self.secure_handler.mask_api_key(self.api_key)}")
@@ -47,6 +58,7 @@ class QwenAdapter(LLMServiceInterface):
             logger.error(f"Failed to initialize Qwen adapter: {e}")
             raise
 
+    @cached_chat_completion
     async def chat_completion(
         self,
         messages: List[ChatMessage],
@@ -61,10 +73,7 @@ class QwenAdapter(LLMServiceInterface):
             raise APIKeyError("Qwen API key not configured")
 
         # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        openai_messages = message_dicts(messages)
 
         # Paramètres de la requête
         params = {
@@ -89,7 +98,7 @@ class QwenAdapter(LLMServiceInterface):
         try:
             response = await self.client.chat.completions.create(**params)
             
-            return ChatResponse(
+            return ChatResponse.model_construct(
                 content=response.choices[0].message.content,
                 provider=self.get_provider_name(),
                 model=response.model,
@@ -102,6 +111,45 @@ class QwenAdapter(LLMServiceInterface):
         except Exception as e:
             raise Exception(f"Qwen API error: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        messages: List[ChatMessage],
+        model_version: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming : le texte est transmis dès sa production
+        
+        Args:
+            messages: Liste des messages de conversation
+            model_version: Version exacte du modèle à utiliser
+            max_tokens: Nombre maximum de tokens (optionnel)
+            temperature: Température pour la génération (optionnel)
+            
+        Yields:
+            str: Fragments de texte, dans l'ordre de génération
+        """
+        if not self.client:
+            raise APIKeyError("Qwen API key not configured")
+
+        params = {
+            "model": model_version,
+            "messages": message_dicts(messages),
+            "stream": True,
+        }
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        if temperature is not None:
+            params["temperature"] = temperature
+
+        try:
+            async for text in openai_text_stream(self.client, params):
+                yield text
+        except Exception as e:
+            raise Exception(f"Qwen API error: {str(e)}")
+
+    @memoize_tool_format
     async def format_tools_for_llm(self, tool_definitions: List[ToolDefinition]) -> List[Dict[str, Any]]:
         """
         Convertit nos ToolDefinition internes vers le format Qwen
@@ -129,7 +177,7 @@ class QwenAdapter(LLMServiceInterface):
         for tool in tool_definitions:
             try:
                 # Récupérer le schéma de l'outil
-                tool_schema = tool.get_tool_schema()
+                tool_schema = tool.get_cached_tool_schema()
                 
                 # Convertir du format OpenAI vers le format Qwen
                 if "function" in tool_schema:
@@ -155,7 +203,7 @@ class QwenAdapter(LLMServiceInterface):
                     })
             except Exception as e:
                 # Log l'erreur mais continue avec les autres outils
-                print(f"Erreur lors du formatage de l'outil {tool.name}: {e}")
+                logger.warning("⚠️ Erreur lors du formatage de l'outil %s: %s", tool.name, e)
                 continue
                 
         return formatted_tools
@@ -176,15 +224,9 @@ class QwenAdapter(LLMServiceInterface):
         if not self.client:
             raise Exception("Qwen API key not configured")
 
-        # Construire les messages avec l'historique
-        messages = list(request.conversation_history)
-        messages.append(ChatMessage(role="user", content=request.message))
-
-        # Conversion des messages Pydantic vers le format OpenAI
-        openai_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Conversion de l'historique vers le format OpenAI, puis ajout du message utilisateur
+        openai_messages = message_dicts(request.conversation_history)
+        openai_messages.append({"role": "user", "content": request.message})
 
         # Paramètres de base
         params = {
@@ -209,28 +251,32 @@ class QwenAdapter(LLMServiceInterface):
 
             # Vérifier si l'IA veut appeler des outils
             # Note: Le format de réponse peut être différent pour Qwen
-            tool_calls = []
-            requires_tool_execution = False
+            # Qwen pourrait utiliser un format différent pour les function calls :
+            # chaque attribut n'est lu qu'une fois
+            function_call = getattr(message, 'function_call', None)
+            message_tool_calls = getattr(message, 'tool_calls', None)
             
-            # Qwen pourrait utiliser un format différent pour les function calls
-            if hasattr(message, 'function_call') and message.function_call:
-                requires_tool_execution = True
-                tool_calls.append(ToolCall(
+            if function_call:
+                tool_calls = [ToolCall(
                     id="qwen_function_call",
-                    tool_name=message.function_call.get('name', 'unknown'),
-                    arguments=eval(message.function_call.get('arguments', '{}')) if message.function_call.get('arguments') else {}
-                ))
-            elif hasattr(message, 'tool_calls') and message.tool_calls:
+                    tool_name=function_call.name or 'unknown',
+                    arguments=json_codec.loads_dict(function_call.arguments)
+                )]
+            elif message_tool_calls:
                 # Au cas où Qwen supporterait aussi le format OpenAI standard
-                requires_tool_execution = True
-                for tool_call in message.tool_calls:
-                    tool_calls.append(ToolCall(
+                tool_calls = [
+                    ToolCall(
                         id=tool_call.id,
                         tool_name=tool_call.function.name,
-                        arguments=eval(tool_call.function.arguments) if tool_call.function.arguments else {}
-                    ))
+                        arguments=json_codec.loads_dict(tool_call.function.arguments)
+                    )
+                    for tool_call in message_tool_calls
+                ]
+            else:
+                tool_calls = []
+            requires_tool_execution = bool(tool_calls)
 
-            return OrchestrationResponse(
+            return OrchestrationResponse.model_construct(
                 content=message.content,
                 tool_calls=tool_calls,
                 provider=self.get_provider_name(),
@@ -255,14 +301,9 @@ class QwenAdapter(LLMServiceInterface):
         """Retourne le nom du fournisseur"""
         return "qwen"
 
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Sequence[str]:
         """Retourne la liste des modèles Qwen disponibles"""
-        return [
-            "qwen-max",
-            "qwen-vl-max",
-            "qwen-plus",
-            "qwen-turbo"
-        ]
+        return QWEN_MODELS
 
     def is_healthy(self) -> bool:
         """Vérifie si le service Qwen est disponible"""
@@ -26,7 +26,7 @@ class MetricsCollector:
     de la plateforme d'orchestration multi-agent selon les standards OpenMetrics.
     
     Métriques collectées:
-    - Appels LLM (count, latency, tokens)
+    - Appels LLM (count, latency, tokens, hits du cache)
     - Exécutions d'outils (count, latency)  
     - Erreurs d'orchestrateur (count par type)
     - Sessions (count, durée, messages)
@@ -72,6 +72,14 @@ class MetricsCollector:
             registry=self.registry
         )
         
+        # Consultations du cache de réponses LLM (hit / miss)
+        self.llm_cache_lookups_count = Counter(
+            name='llm_cache_lookups_count',
+            documentation='Total number of LLM response cache lookups',
+            labelnames=['result'],
+            registry=self.registry
+        )
+        
         # =============================================================================
         # MÉTRIQUES D'ERREURS ET RÉSILIENCE
         # =============================================================================
@@ -207,6 +215,15 @@ class MetricsCollector:
                     token_type=token_type
                 ).inc(count)
     
+    def record_cache_lookup(self, hit: bool):
+        """
+        Enregistre une consultation du cache de réponses LLM
+        
+        Args:
+            hit: True si la réponse a été servie depuis le cache
+        """
+        self.llm_cache_lookups_count.labels(result="hit" if hit else "miss").inc()
+    
     # =============================================================================
     # MÉTHODES D'ENREGISTREMENT OUTILS
     # =============================================================================
@@ -10,10 +10,8 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional, List
 from uuid import UUID
-from src.models.data_contracts import Session, HistoryConfig, SessionManager
+from src.models.data_contracts import Session, HistoryConfig, SessionManager, TraceStep
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +62,19 @@ class InMemorySessionManager(SessionManager):
         self._sessions[str(session.session_id)] = session
         logger.info(f"💾 Session {session.session_id} sauvegardée")
     
+    async def append_trace_steps(self, session: Session, steps: List[TraceStep]) -> None:
+        """
+        Persiste des étapes de trace déjà ajoutées à session.trace
+        
+        En mémoire, la session stockée est l'objet lui-même : il suffit de
+        s'assurer qu'elle est enregistrée (aucune copie ni sérialisation).
+        
+        Args:
+            session: Session dont la trace contient déjà les étapes
+            steps: Étapes ajoutées depuis la dernière sauvegarde
+        """
+        self._sessions.setdefault(str(session.session_id), session)
+    
     async def create_new_session(
         self, 
         agent_name: str, 
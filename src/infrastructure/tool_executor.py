@@ -2,9 +2,11 @@
 
 import asyncio
 import json
+import logging
 import traceback
-from typing import Dict, Callable, Any, List, Optional
-from src.models.data_contracts import ToolCall, ToolResult
+from typing import Dict, Callable, Any, List, Optional, Type
+from src.models.data_contracts import GetCurrentTimeTool, ToolCall, ToolDefinition, ToolResult
+from src.infrastructure.tool_schema_validator import validate_tool_arguments
 from src.infrastructure.tools import (
     get_current_time,
     complex_api_call, 
@@ -12,6 +14,8 @@ from src.infrastructure.tools import (
     get_system_info
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ToolExecutor:
     """
@@ -26,6 +30,11 @@ class ToolExecutor:
             "calculate_expression": calculate_expression,
             "get_system_info": get_system_info
         }
+        
+        # Définitions des outils dont les arguments sont validés avant exécution
+        self.tool_definitions: Dict[str, Type[ToolDefinition]] = {
+            "get_current_time": GetCurrentTimeTool
+        }
     
     async def execute_tool(self, tool_call: ToolCall) -> ToolResult:
         """
@@ -50,6 +59,20 @@ class ToolExecutor:
                     error=error_msg
                 )
             
+            # Validation des arguments contre le schéma de la définition de l'outil
+            tool_definition = self.tool_definitions.get(tool_call.tool_name)
+            validation_error = (
+                validate_tool_arguments(tool_definition, tool_call.arguments)
+                if tool_definition is not None else None
+            )
+            if validation_error is not None:
+                return ToolResult(
+                    tool_call_id=tool_call.id,
+                    success=False,
+                    result=None,
+                    error=f"Arguments invalides pour '{tool_call.tool_name}': {validation_error}"
+                )
+            
             # Récupération de la fonction
             tool_function = self.tool_registry[tool_call.tool_name]
             
@@ -151,7 +174,7 @@ class ToolExecutor:
             
         except Exception as e:
             # En cas d'erreur d'inspection, on retourne les arguments tels quels
-            print(f"Avertissement lors de la préparation des arguments: {e}")
+            logger.warning("⚠️ Avertissement lors de la préparation des arguments: %s", e)
             return arguments
     
     def get_available_tools(self) -> List[str]:
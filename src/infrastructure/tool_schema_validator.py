@@ -0,0 +1,77 @@
+"""
+Validation des arguments d'appels d'outils
+
+Les schémas des paramètres d'outils sont statiques : ils sont compilés une seule
+fois par classe d'outil (fastjsonschema, optionnel), au premier appel de l'outil,
+puis réutilisés pour valider les arguments renvoyés par les LLM avant l'exécution
+des outils.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional, Type
+
+from src.models.data_contracts import ToolDefinition
+
+try:
+    import fastjsonschema
+except ImportError:  # fastjsonschema est optionnel : pas de validation sans lui
+    fastjsonschema = None
+
+logger = logging.getLogger(__name__)
+
+# classe d'outil -> validateur compilé (None si le schéma n'est pas validable)
+_compiled_validators: Dict[Type[ToolDefinition], Optional[Callable[[Any], Any]]] = {}
+
+
+def _get_validator(tool_class: Type[ToolDefinition]) -> Optional[Callable[[Any], Any]]:
+    """
+    Retourne le validateur de l'outil, compilé à la première demande
+
+    Args:
+        tool_class: Classe de définition de l'outil
+
+    Returns:
+        Optional[Callable]: Validateur compilé, None si le schéma n'est pas validable
+    """
+    if tool_class in _compiled_validators:
+        return _compiled_validators[tool_class]
+
+    validator = None
+    try:
+        parameters = tool_class.get_cached_tool_schema()["function"]["parameters"]
+        # Seuls les vrais schémas JSON ({"type": "object", ...}) sont compilés
+        if isinstance(parameters, dict) and "type" in parameters:
+            validator = fastjsonschema.compile(parameters)
+    except Exception as e:
+        logger.warning("⚠️ Schéma de l'outil %s non compilable: %s", tool_class.__name__, e)
+    _compiled_validators[tool_class] = validator
+    return validator
+
+
+def validate_tool_arguments(
+    tool_class: Type[ToolDefinition],
+    arguments: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Valide les arguments d'un appel d'outil contre le schéma de sa définition
+
+    Args:
+        tool_class: Classe de définition de l'outil appelé
+        arguments: Arguments fournis par le LLM
+
+    Returns:
+        Optional[str]: Message d'erreur si les arguments sont invalides, None sinon
+        (y compris lorsque le schéma de l'outil n'est pas validable)
+    """
+    if fastjsonschema is None:
+        return None
+
+    validator = _get_validator(tool_class)
+    if validator is None:
+        return None
+
+    try:
+        validator(arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        return e.message
+    return None
@@ -1,9 +1,13 @@
 """Data Contracts - Pydantic Models for API Validation avec Durcissement Unicode/Sécurité"""
 
 import re
+import sys
+import time
 import unicodedata
-from typing import List, Optional, Any, Dict
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional, Any, Dict, Tuple
+from pydantic import (
+    BaseModel, ConfigDict, Field, PrivateAttr, field_serializer, field_validator, model_validator
+)
 from enum import Enum
 from uuid import UUID, uuid4
 from abc import ABC, abstractmethod
@@ -108,6 +112,9 @@ class LLMProvider(str, Enum):
 
 class ChatMessage(BaseModel):
     """Modèle pour un message de chat avec validation sécurisée"""
+    # Messages immuables : partageables sans copie entre historiques et requêtes
+    model_config = ConfigDict(frozen=True)
+    
     role: str = Field(..., description="Rôle du message: 'user', 'assistant', 'system'")
     content: str = Field(..., description="Contenu du message")
     
@@ -212,11 +219,27 @@ class ToolResult(BaseModel):
     error: Optional[str] = Field(default=None, description="Message d'erreur si échec")
 
 
+# Schémas d'outils déjà construits, par classe d'outil (ils ne dépendent que de la classe)
+_TOOL_SCHEMA_CACHE: Dict[type, Dict[str, Any]] = {}
+
+
 class ToolDefinition(BaseModel):
     """Classe de base pour la définition d'un outil"""
     name: str = Field(..., description="Nom unique de l'outil")
     description: str = Field(..., description="Description de ce que fait l'outil")
     
+    @classmethod
+    def get_cached_tool_schema(cls) -> Dict[str, Any]:
+        """
+        Retourne le schéma de l'outil, construit une seule fois par classe
+        
+        Le dictionnaire retourné est partagé et ne doit pas être modifié.
+        """
+        schema = _TOOL_SCHEMA_CACHE.get(cls)
+        if schema is None:
+            schema = _TOOL_SCHEMA_CACHE[cls] = cls.get_tool_schema()
+        return schema
+    
     @classmethod
     def get_tool_schema(cls) -> Dict[str, Any]:
         """Retourne le schéma JSON de l'outil pour les APIs LLM"""
@@ -285,6 +308,12 @@ class RetryConfig(BaseModel):
         le=60.0,
         description="Délai initial en secondes pour le backoff exponentiel (0.1-60s)"
     )
+    max_delay: float = Field(
+        default=30.0,
+        ge=0.1,
+        le=300.0,
+        description="Délai maximal entre deux tentatives, avant jitter (0.1-300s)"
+    )
     
     @field_validator('max_attempts')
     @classmethod
@@ -319,6 +348,17 @@ class AgentConfig(BaseModel):
         description="Configuration de retry avec backoff pour les appels LLM"
     )
     
+    # Requêtes couvertes (hedging) : fournisseurs sollicités en parallèle si le principal tarde
+    fallback_providers: List[LLMProvider] = Field(
+        default_factory=list,
+        description="Fournisseurs de repli interrogés en parallèle après hedge_delay"
+    )
+    hedge_delay: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="Délai (secondes) avant le lancement des appels de repli"
+    )
+    
     @field_validator('model_version')
     @classmethod
     def validate_model_version(cls, v: str) -> str:
@@ -429,6 +469,13 @@ class AgentDefinition(BaseModel):
 # JALON 4.1-B - CONTRATS DE TRAÇABILITÉ (TRACING)
 # ============================================================================
 
+# Composants connus du traçage (acceptés sans normalisation)
+_TRACE_COMPONENTS = frozenset({
+    'Router', 'Orchestrator', 'LLM', 'HistorySummarizer', 
+    'AgentRouter', 'AgentOrchestrator', 'ToolExecutor', 'SessionManager'
+})
+
+
 class TraceStep(BaseModel):
     """
     Modèle pour une étape unique de traçage dans le cycle d'orchestration
@@ -436,7 +483,8 @@ class TraceStep(BaseModel):
     Chaque TraceStep représente un événement atomique dans le flux d'exécution,
     permettant une observabilité complète du système pour le débogage.
     """
-    timestamp: datetime = Field(default_factory=datetime.now, description="Horodatage précis de l'étape")
+    # Nanosecondes depuis l'epoch (time.time_ns) ; exposé en ISO 8601 à la sérialisation
+    timestamp: int = Field(default_factory=time.time_ns, description="Horodatage précis de l'étape")
     component: str = Field(..., description="Composant responsable (Router/Orchestrator/LLM/HistorySummarizer)")
     event: str = Field(..., description="Type d'événement (start/decision/call/response/error)")
     details: Dict[str, Any] = Field(default_factory=dict, description="Détails spécifiques de l'étape")
@@ -444,21 +492,32 @@ class TraceStep(BaseModel):
     @field_validator('component')
     @classmethod
     def validate_component(cls, v: str) -> str:
-        """Validation du nom de composant"""
-        allowed_components = {
-            'Router', 'Orchestrator', 'LLM', 'HistorySummarizer', 
-            'AgentRouter', 'AgentOrchestrator', 'ToolExecutor', 'SessionManager'
-        }
-        if v not in allowed_components:
+        """Validation du nom de composant (interné : vocabulaire restreint et répétitif)"""
+        if v not in _TRACE_COMPONENTS:
             # Permettre d'autres composants mais normaliser
-            return validate_safe_string(v, "trace_component")
-        return v
+            v = validate_safe_string(v, "trace_component")
+        return sys.intern(v)
     
     @field_validator('event')
     @classmethod
     def validate_event(cls, v: str) -> str:
-        """Validation du type d'événement"""
-        return validate_safe_string(v, "trace_event")
+        """Validation du type d'événement (interné : vocabulaire restreint et répétitif)"""
+        return sys.intern(validate_safe_string(v, "trace_event"))
+    
+    @field_validator('timestamp', mode='before')
+    @classmethod
+    def validate_timestamp(cls, v: Any) -> Any:
+        """Accepte aussi un datetime ou une chaîne ISO 8601 (traces sérialisées)"""
+        if isinstance(v, str):
+            v = datetime.fromisoformat(v)
+        if isinstance(v, datetime):
+            return int(v.timestamp() * 1_000_000) * 1000
+        return v
+    
+    @field_serializer('timestamp')
+    def serialize_timestamp(self, v: int) -> str:
+        """Conversion en ISO 8601 (heure locale), uniquement à la sérialisation"""
+        return datetime.fromtimestamp(v / 1e9).isoformat()
 
 # Type Alias pour une trace complète (liste d'étapes)
 Trace = List[TraceStep]
@@ -514,6 +573,10 @@ Format de sortie :
         return v
 
 
+# Marqueur du message de résumé inséré par la synthèse automatique de l'historique
+SUMMARY_MARKER = "[RÉSUMÉ AUTOMATIQUE]"
+
+
 class Session(BaseModel):
     """
     Modèle pour une session de conversation persistante avec mémoire à long terme
@@ -532,6 +595,63 @@ class Session(BaseModel):
     # JALON 4.1-B: Traçabilité pour observabilité
     trace: Trace = Field(default_factory=list, description="Historique complet des étapes d'exécution pour le débogage")
     
+    # Totaux cumulés des métriques d'historique (mis à jour incrémentalement)
+    _metrics_count: int = PrivateAttr(default=0)
+    _metrics_chars: int = PrivateAttr(default=0)
+    _metrics_words: int = PrivateAttr(default=0)
+    _last_user_index: int = PrivateAttr(default=-1)
+    _has_summary: bool = PrivateAttr(default=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "history":
+            # Nouvel historique (ex: après synthèse) : les totaux sont recalculés
+            self._reset_history_metrics()
+    
+    def _reset_history_metrics(self) -> None:
+        """Réinitialise les totaux cumulés des métriques d'historique"""
+        self._metrics_count = 0
+        self._metrics_chars = 0
+        self._metrics_words = 0
+        self._last_user_index = -1
+        self._has_summary = False
+    
+    def get_last_user_message(self) -> Optional[ChatMessage]:
+        """
+        Retourne le dernier message utilisateur de l'historique
+        
+        L'index est maintenu avec les métriques incrémentales : seuls les
+        messages ajoutés depuis le dernier calcul sont examinés.
+        
+        Returns:
+            Optional[ChatMessage]: Dernier message utilisateur ou None
+        """
+        self.get_history_metrics()
+        if self._last_user_index < 0:
+            return None
+        return self.history[self._last_user_index]
+    
+    def has_summary(self) -> bool:
+        """
+        Indique si l'historique contient un résumé automatique
+        
+        Maintenu avec les métriques incrémentales (voir get_history_metrics).
+        
+        Returns:
+            bool: True si un message contient SUMMARY_MARKER
+        """
+        self.get_history_metrics()
+        return self._has_summary
+    
+    def append_message(self, message: ChatMessage) -> None:
+        """
+        Ajoute un message à l'historique
+        
+        Args:
+            message: Message à ajouter
+        """
+        self.history.append(message)
+    
     @field_validator('agent_name')
     @classmethod
     def validate_agent_name(cls, v: str) -> str:
@@ -551,27 +671,44 @@ class Session(BaseModel):
         """
         Calcule les métriques de l'historique pour les seuils de synthèse
         
+        L'historique étant en ajout seul entre deux synthèses, seuls les messages
+        ajoutés depuis le dernier calcul sont parcourus.
+        
         Returns:
             Dict contenant messages, chars, words, estimated_tokens
         """
-        if not self.history:
-            return {"messages": 0, "chars": 0, "words": 0, "estimated_tokens": 0}
+        history = self.history
+        if len(history) < self._metrics_count:
+            # Historique raccourci sur place : recalcul complet
+            self._reset_history_metrics()
         
-        total_chars = 0
-        total_words = 0
+        total_chars = self._metrics_chars
+        total_words = self._metrics_words
+        last_user_index = self._last_user_index
+        has_summary = self._has_summary
         
-        for message in self.history:
+        for index in range(self._metrics_count, len(history)):
+            message = history[index]
             content = message.content or ""
             total_chars += len(content)
             # Approximation simple du comptage de mots
-            words = len(content.split())
-            total_words += words
+            total_words += len(content.split())
+            if message.role == "user":
+                last_user_index = index
+            if not has_summary and SUMMARY_MARKER in content:
+                has_summary = True
+        
+        self._metrics_count = len(history)
+        self._metrics_chars = total_chars
+        self._metrics_words = total_words
+        self._last_user_index = last_user_index
+        self._has_summary = has_summary
         
         # Estimation approximative des tokens (1 token ≈ 4 caractères en moyenne)
         estimated_tokens = total_chars // 4
         
         return {
-            "messages": len(self.history),
+            "messages": len(history),
             "chars": total_chars,
             "words": total_words,
             "estimated_tokens": estimated_tokens
@@ -584,16 +721,27 @@ class Session(BaseModel):
         Returns:
             bool: True si au moins un seuil est dépassé
         """
-        if not self.history_config.enabled:
-            return False
+        return self.get_history_metrics_and_check()[1]
+    
+    def get_history_metrics_and_check(self) -> Tuple[Dict[str, int], bool]:
+        """
+        Calcule les métriques et vérifie les seuils en un seul parcours de l'historique
         
+        Returns:
+            Tuple[Dict[str, int], bool]: Métriques (voir get_history_metrics) et
+                True si la synthèse doit être déclenchée
+        """
         metrics = self.get_history_metrics()
         
-        return (
-            metrics["messages"] >= self.history_config.message_threshold or
-            metrics["chars"] >= self.history_config.char_threshold or
-            metrics["words"] >= self.history_config.word_threshold or
-            metrics["estimated_tokens"] >= self.history_config.token_threshold
+        if not self.history_config.enabled:
+            return metrics, False
+        
+        config = self.history_config
+        return metrics, (
+            metrics["messages"] >= config.message_threshold or
+            metrics["chars"] >= config.char_threshold or
+            metrics["words"] >= config.word_threshold or
+            metrics["estimated_tokens"] >= config.token_threshold
         )
 
 
@@ -628,6 +776,20 @@ class SessionManager(ABC):
         """
         pass
     
+    async def append_trace_steps(self, session: Session, steps: List[TraceStep]) -> None:
+        """
+        Persiste des étapes de trace déjà ajoutées à session.trace
+        
+        L'implémentation par défaut sauvegarde la session entière. Un stockage
+        sérialisé peut la surcharger pour n'écrire que les nouvelles étapes
+        au lieu de re-sérialiser toute la trace à chaque sauvegarde.
+        
+        Args:
+            session: Session dont la trace contient déjà les étapes
+            steps: Étapes ajoutées depuis la dernière sauvegarde
+        """
+        await self.save_session(session)
+    
     @abstractmethod
     async def create_new_session(
         self, 